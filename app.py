@@ -1,72 +1,195 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 from flask_cors import CORS
 from crypto_scraper import CryptoNewsScraper
-import json
-import os
+from article_store import ArticleStore
+from refresh_jobs import RefreshJobManager
+from feed_scheduler import FeedScheduler, FeedYieldTracker, build_feed_groups
+from werkzeug.serving import is_running_from_reloader
 from datetime import datetime
-import threading
-import time
-import schedule
+import atexit
+import queue
 
 app = Flask(__name__)
 CORS(app)
 
 # Global scraper instance
 scraper = CryptoNewsScraper()
+# Articles served by the API, kept in memory instead of re-reading the JSON file per request
+article_store = ArticleStore('crypto_treasury_news.json')
 last_update_time = None
 
-def background_scraper():
-    """Background task to run the scraper periodically"""
+# Seconds between keep-alive comments on idle /api/stream connections
+STREAM_HEARTBEAT_SECONDS = 15
+
+# Page size limits for /api/articles
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def publish_scrape_results():
+    """Save the scraper's articles and push them into the in-memory store"""
+    last_updated = scraper.save_to_json()
+    article_store.update(scraper.news_data, last_updated)
+
+def run_scrape(progress_callback=None, labels=None):
+    """Scrape all feeds (or only labels) and publish the results; only ever run through refresh_jobs"""
     global last_update_time
-    while True:
-        try:
-            print("Running background scraper...")
-            scraper.scrape_all_crypto_treasury_news()
-            scraper.save_to_json()
-            last_update_time = datetime.now()
-            print(f"Scraper completed at {last_update_time}")
-        except Exception as e:
-            print(f"Error in background scraper: {e}")
-        
-        # Wait for 30 minutes before next run
-        time.sleep(1800)
+    articles = scraper.scrape_all_crypto_treasury_news(progress_callback=progress_callback, labels=labels)
+    publish_scrape_results()
+    last_update_time = datetime.now()
+    return articles
+
+# Single-flight scrape runner shared by manual refreshes and the background scraper
+refresh_jobs = RefreshJobManager(run_scrape)
+
+# Per-feed polling, each interval adapting to how often that feed or query yields new articles
+feed_scheduler = FeedScheduler(refresh_jobs, build_feed_groups(scraper), tracker=FeedYieldTracker())
 
 @app.route('/')
 def index():
     """Main dashboard page"""
     return render_template('index.html')
 
+def news_payload_response(payload):
+    """Serve a pre-serialized news payload, answering If-None-Match with 304"""
+    use_gzip = 'gzip' in request.accept_encodings
+    # Strong validators must differ per content encoding
+    etag = f"{payload.etag}-gzip" if use_gzip else payload.etag
+    
+    if request.if_none_match.contains(payload.etag) or request.if_none_match.contains(f"{payload.etag}-gzip"):
+        response = Response(status=304)
+    else:
+        response = Response(payload.gzipped if use_gzip else payload.body, mimetype='application/json')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/api/news')
 def get_news():
     """API endpoint to get latest news"""
     try:
-        # Try to load from file first
-        if os.path.exists('crypto_treasury_news.json'):
-            with open('crypto_treasury_news.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return jsonify(data)
-        else:
-            # If no file exists, run scraper once
-            articles = scraper.scrape_all_crypto_treasury_news()
-            scraper.save_to_json()
-            return jsonify({
-                'last_updated': datetime.now().isoformat(),
-                'articles': articles
-            })
+        # Serve from memory; the store reloads the file only when it changes
+        if not article_store.has_data():
+            # If no data exists yet, run scraper once (or wait for the run in flight)
+            job, _ = refresh_jobs.start()
+            job.wait()
+        
+        # Incremental clients pass the cursor from their last response
+        since = request.args.get('since')
+        if since:
+            return jsonify(article_store.get_changes(since))
+        return news_payload_response(article_store.get_payload())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/stream')
+def stream_news():
+    """Server-Sent Events stream of article changes, pushed as soon as the store is updated"""
+    subscriber = article_store.subscribe()
+    
+    def generate():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    cursor, data = subscriber.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Dropped for falling behind: end the stream and let the client reconnect
+                    if not article_store.is_subscribed(subscriber):
+                        return
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f'id: {cursor}\nevent: news\ndata: {data}\n\n'
+        finally:
+            article_store.unsubscribe(subscriber)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/refresh', methods=['GET', 'POST'])
 def refresh_news():
-    """API endpoint to manually refresh news"""
+    """API endpoint to start a news refresh in the background
+    
+    Returns 202 with the job id at once. If a scrape is already running the
+    caller joins it instead of starting another one.
+    """
     try:
-        articles = scraper.scrape_all_crypto_treasury_news()
-        scraper.save_to_json()
-        return jsonify({
-            'last_updated': datetime.now().isoformat(),
-            'articles': articles,
-            'message': 'News refreshed successfully'
+        job, started = refresh_jobs.start()
+        status_url = f"/api/refresh/{job.id}"
+        response = jsonify({
+            'job_id': job.id,
+            'status': job.status,
+            'joined': not started,
+            'status_url': status_url,
+            'message': 'Refresh started' if started else 'Refresh already in progress'
         })
+        response.status_code = 202
+        response.headers['Location'] = status_url
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/refresh/<job_id>')
+def refresh_status(job_id):
+    """API endpoint to get the progress of a refresh job, per feed"""
+    job = refresh_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown refresh job: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/articles')
+def get_articles():
+    """API endpoint to page through the article history
+    
+    Query parameters: start, end (ISO dates, end exclusive), source, type, query,
+    fingerprint (from an article, for every archived copy of that story), limit,
+    and either cursor (from next_cursor) or page.
+    """
+    try:
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        result = scraper.history.query_articles(
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            source=request.args.get('source'),
+            article_type=request.args.get('type'),
+            query=request.args.get('query'),
+            fingerprint=request.args.get('fingerprint'),
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            page=request.args.get('page', type=int)
+        )
+        result['limit'] = limit
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/schedule')
+def get_schedule():
+    """API endpoint to get each feed group's polling interval and next run"""
+    return jsonify({'groups': feed_scheduler.get_status()})
+
+@app.route('/api/search')
+def search_articles():
+    """API endpoint for ranked full-text search over the article history
+    
+    Query parameters: q (required), limit and page.
+    """
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({'error': 'Missing search query parameter q'}), 400
+    try:
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        page = max(request.args.get('page', 1, type=int), 1)
+        result = scraper.history.search(text, limit=limit, page=page)
+        result.update({'query': text, 'limit': limit})
+        return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -74,29 +197,9 @@ def refresh_news():
 def get_stats():
     """API endpoint to get dashboard statistics"""
     try:
-        if os.path.exists('crypto_treasury_news.json'):
-            with open('crypto_treasury_news.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                articles = data.get('articles', [])
-                
-                # Calculate statistics
-                total_articles = len(articles)
-                sources = {}
-                queries = {}
-                
-                for article in articles:
-                    source = article.get('source', 'Unknown')
-                    query = article.get('query', 'Unknown')
-                    
-                    sources[source] = sources.get(source, 0) + 1
-                    queries[query] = queries.get(query, 0) + 1
-                
-                return jsonify({
-                    'total_articles': total_articles,
-                    'top_sources': dict(sorted(sources.items(), key=lambda x: x[1], reverse=True)[:5]),
-                    'top_queries': dict(sorted(queries.items(), key=lambda x: x[1], reverse=True)[:5]),
-                    'last_updated': data.get('last_updated')
-                })
+        if article_store.has_data():
+            # Aggregates are maintained as articles come and go, so this is a cheap read
+            return jsonify(article_store.get_stats())
         else:
             return jsonify({
                 'total_articles': 0,
@@ -108,16 +211,13 @@ def get_stats():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    # Start background scraper in a separate thread
-    scraper_thread = threading.Thread(target=background_scraper, daemon=True)
-    scraper_thread.start()
+    debug = True
     
-    # Run initial scrape
-    try:
-        scraper.scrape_all_crypto_treasury_news()
-        scraper.save_to_json()
-        last_update_time = datetime.now()
-    except Exception as e:
-        print(f"Initial scrape failed: {e}")
+    # The debug reloader runs this module in a watcher and a serving process;
+    # only the serving process schedules scrapes. The first run of every feed
+    # group starts right away, so there is no separate initial scrape.
+    if not debug or is_running_from_reloader():
+        feed_scheduler.start()
+        atexit.register(feed_scheduler.stop)
     
-    app.run(debug=True, host='0.0.0.0', port=5006) 
\ No newline at end of file
+    app.run(debug=debug, host='0.0.0.0', port=5006)
@@ -0,0 +1,289 @@
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import queue
+import threading
+import logging
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import List, Dict, Any, NamedTuple, Optional
+
+from crypto_scraper import ensure_annotated, parse_published
+from news_storage import load_news_file
+
+logger = logging.getLogger(__name__)
+
+# Number of entries kept in each top-k breakdown
+TOP_K = 5
+
+# Number of add/remove changes kept for /api/news?since=; older cursors get a full reset
+MAX_CHANGES = 5000
+
+# Pending events per /api/stream client; a client that falls this far behind is dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+class ArticleAggregates:
+    """Per-source, per-query, per-type, per-hour and per-coin counts kept up to date incrementally
+
+    Counters change only for articles that are added or removed, and the top-k
+    lists are rebuilt with a bounded heap after each change, so reading the
+    stats never touches the articles themselves.
+    """
+
+    DIMENSIONS = ('sources', 'queries', 'article_types', 'hours', 'coins')
+
+    def __init__(self, top_k: int = TOP_K):
+        self.top_k = top_k
+        self.counters = {dimension: Counter() for dimension in self.DIMENSIONS}
+        self.total = 0
+        self.snapshot = self._build_snapshot()
+
+    @staticmethod
+    def _keys(article: Dict[str, Any]) -> Dict[str, List[str]]:
+        """The counter keys an article contributes to, per dimension"""
+        try:
+            hour = parse_published(article).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:00:00+00:00')
+        except Exception:
+            hour = 'Unknown'
+        return {
+            'sources': [article.get('source', 'Unknown')],
+            'queries': [article.get('query', 'Unknown')],
+            'article_types': [article['article_type']],
+            'hours': [hour],
+            'coins': article['coins']
+        }
+
+    def apply(self, added: List[Dict[str, Any]], removed: List[Dict[str, Any]]):
+        """Update the counts for added and removed articles and refresh the snapshot"""
+        for articles, delta in ((added, 1), (removed, -1)):
+            for article in articles:
+                for dimension, keys in self._keys(article).items():
+                    counter = self.counters[dimension]
+                    for key in keys:
+                        counter[key] += delta
+                        if counter[key] <= 0:
+                            del counter[key]
+                self.total += delta
+        self.snapshot = self._build_snapshot()
+
+    def _top(self, counter: Counter) -> Dict[str, int]:
+        return dict(heapq.nlargest(self.top_k, counter.items(), key=itemgetter(1)))
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        return {
+            'total_articles': self.total,
+            'total_sources': len(self.counters['sources']),
+            'total_queries': len(self.counters['queries']),
+            'top_sources': self._top(self.counters['sources']),
+            'top_queries': self._top(self.counters['queries']),
+            'top_coins': self._top(self.counters['coins']),
+            'article_types': dict(self.counters['article_types']),
+            'hourly_counts': dict(sorted(self.counters['hours'].items()))
+        }
+
+class NewsPayload(NamedTuple):
+    """A serialized /api/news body for one version of the data"""
+    etag: str
+    body: bytes
+    gzipped: bytes
+
+def build_news_payload(data: Dict[str, Any]) -> NewsPayload:
+    """Serialize and gzip the news data once, with a strong ETag derived from the body"""
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    return NewsPayload(etag=etag, body=body, gzipped=gzip.compress(body, compresslevel=6))
+
+class ArticleStore:
+    """In-process copy of the saved news data served by the Flask API
+
+    The background scraper pushes new articles in directly. The JSON file is only
+    re-read when its mtime changes, e.g. after another process rewrote it.
+    """
+
+    def __init__(self, filename: str = "crypto_treasury_news.json"):
+        self.filename = filename
+        self.lock = threading.RLock()
+        self.articles = []
+        self.last_updated = None
+        self.loaded = False
+        self.aggregates = ArticleAggregates()
+        self._payload = None
+        self._mtime = None
+        # Change feed: every added or removed article gets the next sequence number.
+        # The epoch changes per process so cursors from a previous run force a reset.
+        self.epoch = uuid.uuid4().hex[:8]
+        self.sequence = 0
+        self.changes = deque(maxlen=MAX_CHANGES)
+        # Queues of connected /api/stream clients, each fed the same serialized events
+        self.subscribers = set()
+        self.subscribers_lock = threading.Lock()
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.filename).st_mtime
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """Reload from disk if the file changed since it was last read or written; returns True on reload"""
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        with self.lock:
+            if mtime == self._mtime:
+                return False
+            try:
+                data = load_news_file(self.filename)
+            except Exception as e:
+                logger.error(f"Error loading {self.filename}: {e}")
+                return False
+            self._set(data.get('articles', []), data.get('last_updated'))
+            self._mtime = mtime
+            logger.info(f"Reloaded {len(self.articles)} articles from {self.filename}")
+            return True
+
+    def update(self, articles: List[Dict[str, Any]], last_updated: Optional[str] = None):
+        """Replace the articles with a fresh scrape result (already saved to the file)"""
+        with self.lock:
+            self._set(articles, last_updated or datetime.now().isoformat())
+            # The file on disk now matches memory, so don't read it back
+            self._mtime = self._file_mtime()
+
+    def _set(self, articles: List[Dict[str, Any]], last_updated: Optional[str]):
+        # Files written before ingest-time classification lack article_type/coins
+        ensure_annotated(articles)
+        previous = {article.get('link'): article for article in self.articles}
+        current = {article.get('link'): article for article in articles}
+        added = [article for link, article in current.items() if link not in previous]
+        removed = [article for link, article in previous.items() if link not in current]
+        self.aggregates.apply(added, removed)
+        since = self.cursor
+        for article in removed:
+            self.sequence += 1
+            self.changes.append((self.sequence, article.get('link'), None))
+        for article in added:
+            self.sequence += 1
+            self.changes.append((self.sequence, article.get('link'), article))
+
+        self.articles = list(articles)
+        self.last_updated = last_updated
+        self.loaded = True
+        # Serialized on the next read, once per version of the data
+        self._payload = None
+        
+        if added or removed:
+            self._publish({
+                'last_updated': self.last_updated,
+                'since': since,
+                'cursor': self.cursor,
+                'reset': False,
+                'added': added,
+                'removed': [article.get('link') for article in removed]
+            })
+
+    def subscribe(self) -> queue.Queue:
+        """Register a stream client; it receives (cursor, json) tuples for every change"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.subscribers_lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        with self.subscribers_lock:
+            self.subscribers.discard(subscriber)
+
+    def is_subscribed(self, subscriber: queue.Queue) -> bool:
+        with self.subscribers_lock:
+            return subscriber in self.subscribers
+
+    def _publish(self, event: Dict[str, Any]):
+        """Serialize a change once and fan it out to every subscriber"""
+        with self.subscribers_lock:
+            subscribers = list(self.subscribers)
+        if not subscribers:
+            return
+        
+        message = (event['cursor'], json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Stalled clients are dropped and catch up with ?since= when they reconnect
+                logger.warning("Dropping a stream subscriber that stopped reading")
+                self.unsubscribe(subscriber)
+
+    def has_data(self) -> bool:
+        """Whether any data has been loaded or pushed yet"""
+        self.reload_if_changed()
+        return self.loaded
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the precomputed statistics plus last_updated"""
+        self.reload_if_changed()
+        with self.lock:
+            stats = dict(self.aggregates.snapshot)
+            stats['last_updated'] = self.last_updated
+            return stats
+
+    def get_payload(self) -> NewsPayload:
+        """Get the pre-serialized /api/news body and its ETag for the current data"""
+        self.reload_if_changed()
+        with self.lock:
+            if self._payload is None:
+                self._payload = build_news_payload({
+                    'last_updated': self.last_updated,
+                    'cursor': self.cursor,
+                    'articles': self.articles
+                })
+            return self._payload
+
+    @property
+    def cursor(self) -> str:
+        """Opaque cursor for the current position in the change feed"""
+        return f"{self.epoch}-{self.sequence}"
+
+    def _parse_cursor(self, cursor: str) -> Optional[int]:
+        """The sequence number of a cursor from this process, or None if it can't be used"""
+        epoch, _, sequence = (cursor or '').partition('-')
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        oldest = self.changes[0][0] if self.changes else self.sequence + 1
+        if sequence > self.sequence or sequence < oldest - 1:
+            return None
+        return sequence
+
+    def get_changes(self, since: str) -> Dict[str, Any]:
+        """Get the articles added and the links removed after the given cursor
+
+        Unknown, expired or foreign cursors return the full article list with reset=True.
+        """
+        self.reload_if_changed()
+        with self.lock:
+            sequence = self._parse_cursor(since)
+            if sequence is None:
+                return {
+                    'last_updated': self.last_updated,
+                    'cursor': self.cursor,
+                    'reset': True,
+                    'articles': self.articles
+                }
+            
+            # The latest change per link wins; re-added links replace the client's copy
+            latest = {}
+            for change_sequence, link, article in reversed(self.changes):
+                if change_sequence <= sequence:
+                    break
+                latest.setdefault(link, article)
+            
+            return {
+                'last_updated': self.last_updated,
+                'cursor': self.cursor,
+                'reset': False,
+                'added': [article for article in latest.values() if article is not None],
+                'removed': [link for link, article in latest.items() if article is None]
+            }
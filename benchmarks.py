@@ -0,0 +1,282 @@
+"""Micro-benchmarks for the scraper hot paths.
+
+Usage:
+    python benchmarks.py classifier [--iterations N]
+    python benchmarks.py normalizer [--iterations N]
+    python benchmarks.py persistence [--iterations N]
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import requests
+
+from crypto_scraper import (CryptoNewsScraper, EXCLUDE_PATTERNS, NEW_ANNOUNCEMENT_PATTERNS,
+                            ArticleHistory, HTTPValidatorCache, ResolvedURLCache, SeenItemIndex)
+from news_storage import load_news_file, save_news_file, msgpack, orjson
+
+# Headlines covering accepted, rejected and excluded articles
+SAMPLE_HEADLINES = [
+    ("Strategy buys 155 BTC for $18 million, boosting treasury holdings - Cryptopolitan",
+     "Strategy announced it has added bitcoin to its corporate treasury."),
+    ("SharpLink announces plans to expand its treasury with ethereum - CoinDesk",
+     "The company will increase its ETH reserves."),
+    ("Matador acquires additional bitcoin for treasury reserves",
+     "Matador Technologies adds more BTC to its balance sheet."),
+    ("Company launches new crypto treasury trading desk",
+     "A digital asset treasury desk for institutional clients."),
+    ("Bitcoin treasury entities collectively added 20,000 BTC last week",
+     "Public companies and treasury entities grew their holdings."),
+    ("Bitcoin price analysis: BTC tests resistance level as treasury demand grows",
+     "Technical analysis of the BTC market."),
+    ("Tether adds 1,000 BTC to reserves holdings",
+     "Tether bought more bitcoin for its reserves."),
+    ("VivoPower unveils new treasury strategy for XRP",
+     "The crypto company revealed an XRP treasury strategy."),
+    ("Ethereum staking yields climb as validators grow",
+     "Market overview for the ETH staking sector."),
+    ("Federal Reserve holds rates steady; treasury yields fall",
+     "Bond markets react to the central bank decision."),
+]
+
+def create_benchmark_scraper() -> CryptoNewsScraper:
+    """A scraper with in-memory stores and no query plan, so benchmarks leave the working directory alone"""
+    return CryptoNewsScraper(seen_index=SeenItemIndex(''), url_cache=ResolvedURLCache(''),
+                             history=ArticleHistory(''), validator_cache=HTTPValidatorCache(''),
+                             session=requests.Session(), feeds=[], queries=[])
+
+def legacy_is_treasury_expansion(scraper: CryptoNewsScraper, title: str, description: str) -> bool:
+    """The original per-call implementation of is_treasury_expansion, kept for comparison"""
+    text = f"{title} {description}".lower()
+    if not any(keyword in text for keyword in scraper.crypto_keywords):
+        return False
+    if not any(keyword in text for keyword in scraper.treasury_keywords):
+        return False
+    exclude_patterns = list(EXCLUDE_PATTERNS)
+    if any(pattern in text for pattern in exclude_patterns):
+        return False
+    new_announcement_patterns = list(NEW_ANNOUNCEMENT_PATTERNS)
+    for pattern in new_announcement_patterns:
+        if re.search(pattern, text):
+            return True
+    return False
+
+def legacy_normalize_title(title: str) -> str:
+    """The original per-call implementation of normalize_title, kept for comparison"""
+    # Remove common prefixes and suffixes
+    normalized = title.lower()
+
+    # Remove common prefixes
+    prefixes_to_remove = [
+        'bitcoin news today:',
+        'crypto news:',
+        'breaking:',
+        'latest:',
+        'update:',
+        'news:',
+        'trending:'
+    ]
+
+    for prefix in prefixes_to_remove:
+        if normalized.startswith(prefix):
+            normalized = normalized[len(prefix):].strip()
+
+    # Remove source suffixes (e.g., " - Cryptopolitan")
+    if ' - ' in normalized:
+        normalized = normalized.split(' - ')[0].strip()
+
+    # Extract key information (company, amount, action)
+    # Extract company name and key numbers - expanded list
+    company_pattern = r'\b(strategy|matador|capital\s+b|bitmine|tether|microstrategy|tesla|square|coinbase|binance|sharplink|vivopower|bnc|trump\s+family)\b'
+
+    company_match = re.search(company_pattern, normalized)
+    if not company_match:
+        return normalized
+
+    company = company_match.group(1)
+
+    # Look for patterns like "buys 155 BTC" or "Adds 155 BTC" first
+    acquisition_pattern = r'\b(buys?|adds?|acquires?|purchases?)\s+(\d+)\s*(btc|bitcoin|eth|ethereum|bnb|sol|ada|dot|link|avax|matic)\b'
+    acquisition_match = re.search(acquisition_pattern, normalized)
+
+    if acquisition_match:
+        number = acquisition_match.group(2)
+        crypto = acquisition_match.group(3)
+        return f"{company} {number} {crypto}"
+
+    # Fallback: look for the first number that appears with crypto in the title
+    number_pattern = r'\b(\d+)\s*(btc|bitcoin|eth|ethereum|bnb|sol|ada|dot|link|avax|matic)\b'
+    number_matches = list(re.finditer(number_pattern, normalized))
+
+    if number_matches:
+        # Take the first match (usually the acquisition amount)
+        number = number_matches[0].group(1)
+        crypto = number_matches[0].group(2)
+        return f"{company} {number} {crypto}"
+
+    # For announcements without specific numbers, use company + key action
+    action_pattern = r'\b(announces|announced|adds|added|acquires|acquired|buys|bought|purchases|purchased)\b'
+    action_match = re.search(action_pattern, normalized)
+    if action_match:
+        action = action_match.group(1)
+        return f"{company} {action}"
+
+    # Special handling for MicroStrategy to avoid duplicates
+    if company == "strategy" or company == "microstrategy":
+        # Look for specific amounts to differentiate
+        amount_pattern = r'\b(\d+)\s*(btc|bitcoin|eth|ethereum)\b'
+        amount_match = re.search(amount_pattern, normalized)
+        if amount_match:
+            amount = amount_match.group(1)
+            crypto = amount_match.group(2)
+            return f"microstrategy {amount} {crypto}"
+
+        # Look for specific announcement patterns
+        announcement_patterns = [
+            r'\b(announces|announced)\s+(?:that\s+)?(?:it\s+)?(?:has\s+)?(?:will\s+)?(?:plans\s+to\s+)?(?:to\s+)?(?:add|acquire|buy|purchase|expand|increase)',
+            r'\b(adds|added|acquires|acquired|buys|bought|purchases|purchased)\s+(?:an?\s+)?(?:additional\s+)?(?:more\s+)?(?:bitcoin|btc|ethereum|eth)',
+            r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)'
+        ]
+
+        for pattern in announcement_patterns:
+            if re.search(pattern, normalized):
+                # Extract the action and any numbers
+                action_match = re.search(r'\b(announces?|announced|adds?|added|acquires?|acquired|buys?|bought|purchases?|purchased|expands?|expanded|increases?|increased|boosts?|boosted)\b', normalized)
+                if action_match:
+                    action = action_match.group(1)
+                    return f"microstrategy {action}"
+
+        return "microstrategy announcement"
+
+    return normalized
+
+def load_corpus(filename: str = "crypto_treasury_news.json") -> List[Tuple[str, str]]:
+    """Sample headlines plus any articles saved by the scraper"""
+    corpus = list(SAMPLE_HEADLINES)
+    if os.path.exists(filename):
+        for article in load_news_file(filename).get('articles', []):
+            corpus.append((article.get('title', ''), article.get('description', '')))
+    return corpus
+
+def time_per_item(func, corpus: List[Tuple[str, str]], iterations: int) -> float:
+    """Average seconds per call of func over the corpus"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for title, description in corpus:
+            func(title, description)
+    return (time.perf_counter() - start) / (iterations * len(corpus))
+
+def benchmark_classifier(iterations: int):
+    scraper = create_benchmark_scraper()
+    corpus = load_corpus()
+
+    mismatches = [title for title, description in corpus
+                  if legacy_is_treasury_expansion(scraper, title, description)
+                  != scraper.is_treasury_expansion(title, description)]
+    if mismatches:
+        raise SystemExit(f"Classifier results differ for: {mismatches}")
+
+    before = time_per_item(lambda t, d: legacy_is_treasury_expansion(scraper, t, d), corpus, iterations)
+    after = time_per_item(scraper.is_treasury_expansion, corpus, iterations)
+    print(f"is_treasury_expansion over {len(corpus)} items x {iterations}")
+    print(f"  before: {before * 1e6:8.2f} us/item")
+    print(f"  after:  {after * 1e6:8.2f} us/item  ({before / after:.1f}x faster)")
+
+def benchmark_normalizer(iterations: int):
+    scraper = create_benchmark_scraper()
+    # Syndicated headlines repeat across queries, so the dedup pass sees many duplicates
+    titles = [title for title, _ in load_corpus()] * 20
+
+    normalized = scraper.normalize_titles(titles)
+    mismatches = [title for title, fingerprint in zip(titles, normalized)
+                  if legacy_normalize_title(title) != fingerprint]
+    if mismatches:
+        raise SystemExit(f"Normalized titles differ for: {sorted(set(mismatches))}")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        [legacy_normalize_title(title) for title in titles]
+    before = (time.perf_counter() - start) / (iterations * len(titles))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        scraper.normalize_titles(titles)
+    after = (time.perf_counter() - start) / (iterations * len(titles))
+
+    print(f"normalize_titles over {len(titles)} titles x {iterations}")
+    print(f"  before: {before * 1e6:8.2f} us/title")
+    print(f"  after:  {after * 1e6:8.2f} us/title  ({before / after:.1f}x faster)")
+
+def legacy_save_news(filename: str, data: Dict[str, Any]):
+    """The original in-place, pretty-printed save_to_json write, kept for comparison"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def legacy_load_news(filename: str) -> Dict[str, Any]:
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def sample_news_data(article_count: int = 2000) -> Dict[str, Any]:
+    """A news file's worth of articles built from the corpus"""
+    corpus = load_corpus()
+    articles = []
+    for i in range(article_count):
+        title, description = corpus[i % len(corpus)]
+        articles.append({
+            'title': title,
+            'link': f"https://example.com/news/{i}",
+            'published': f"2025-08-13T{i % 24:02d}:00:00+00:00",
+            'source': 'Example News',
+            'description': description,
+            'query': 'bitcoin treasury expansion'
+        })
+    return {'last_updated': '2025-08-13T12:00:00', 'articles': articles}
+
+def benchmark_persistence(iterations: int):
+    data = sample_news_data()
+    variants = [('legacy indent=2', legacy_save_news, legacy_load_news)]
+    formats = ['json'] + (['orjson'] if orjson else []) + (['msgpack'] if msgpack else [])
+    for format in formats:
+        for compress in (False, True):
+            label = f"{format}{' + gzip' if compress else ''}"
+            save = lambda filename, data, format=format, compress=compress: save_news_file(filename, data, format, compress)
+            variants.append((label, save, load_news_file))
+
+    print(f"News file with {len(data['articles'])} articles x {iterations}")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'news.json')
+        for label, save, load in variants:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                save(filename, data)
+            write_time = (time.perf_counter() - start) / iterations
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                loaded = load(filename)
+            read_time = (time.perf_counter() - start) / iterations
+
+            if loaded['articles'] != data['articles']:
+                raise SystemExit(f"{label} did not round-trip the articles")
+            size = os.path.getsize(filename)
+            print(f"  {label:16s} write {write_time * 1e3:7.2f} ms  read {read_time * 1e3:7.2f} ms  size {size / 1024:8.1f} KiB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('benchmark', choices=['classifier', 'normalizer', 'persistence'])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.benchmark == 'classifier':
+        benchmark_classifier(args.iterations)
+    elif args.benchmark == 'normalizer':
+        benchmark_normalizer(args.iterations)
+    elif args.benchmark == 'persistence':
+        benchmark_persistence(args.iterations)
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,1105 @@
-import xmltodict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
 import json
 import time
 import re
-from typing import List, Dict, Any
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import urllib.parse
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import logging
+import xml.etree.ElementTree as ET
+
+from news_storage import atomic_write, save_news_file
+
+# Brotli decoding is optional; only advertise it when urllib3 can decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Google News search queries used for NEW crypto treasury announcements
+GOOGLE_NEWS_QUERIES = [
+    # Primary announcement queries
+    "crypto treasury announcement",
+    "bitcoin treasury announcement",
+    "ethereum treasury announcement",
+    "cryptocurrency treasury announcement",
+    "crypto company announces bitcoin",
+    "crypto company announces ethereum",
+    "crypto company announces treasury",
+    "bitcoin treasury acquisition announcement",
+    "ethereum treasury purchase announcement",
+
+    # New initiative queries
+    "crypto treasury strategy announcement",
+    "crypto treasury policy announcement",
+    "crypto treasury program announcement",
+    "crypto treasury initiative announcement",
+
+    # Recent acquisition queries (last 24 hours)
+    "crypto company adds bitcoin today",
+    "crypto company adds ethereum today",
+    "crypto company buys bitcoin today",
+    "crypto company buys ethereum today",
+    "treasury bitcoin acquisition today",
+    "treasury ethereum acquisition today",
+
+    # New program queries
+    "crypto treasury investment program",
+    "crypto treasury acquisition program",
+    "crypto treasury expansion program",
+
+    # Trading desk and treasury launch queries
+    "crypto trading desk launch",
+    "crypto treasury desk announcement",
+    "digital asset treasury launch",
+    "crypto treasury trading desk",
+    "company launches crypto treasury",
+    "corporation crypto treasury announcement"
+]
+
+# Keywords a publisher feed item must mention before it is classified
+PUBLISHER_PREFILTER_KEYWORDS = [
+    'treasury', 'bitcoin', 'ethereum', 'crypto', 'cryptocurrency',
+    'acquisition', 'purchase', 'buys', 'adds', 'announces',
+    'launches', 'investment', 'reserves', 'holdings',
+    'microstrategy', 'strategy', 'tesla', 'square', 'coinbase',
+    'binance', 'tether', 'matador', 'capital b', 'sharplink',
+    'vivopower', 'bnc', 'trump family'
+]
+
+# Publisher RSS feeds. Adding a feed only needs a new entry here:
+#   urls               - tried in order until one answers
+#   source / query     - stored on every article from the feed
+#   prefilter_keywords - cheap keyword check before is_treasury_expansion (None to skip)
+#   date_ordered       - newest-first feed, so reading can stop at the 24 hour cutoff
+RSS_FEEDS = [
+    {
+        'name': 'CoinDesk',
+        'urls': ["https://www.coindesk.com/arc/outboundfeeds/rss/"],
+        'source': 'CoinDesk',
+        'query': 'coindesk_rss',
+        'prefilter_keywords': PUBLISHER_PREFILTER_KEYWORDS,
+        'date_ordered': True
+    },
+    {
+        'name': 'CryptoNews',
+        'urls': [
+            "https://cryptonews.com/news/feed",
+            "https://cryptonews.com/rss",
+            "https://cryptonews.com/feed"
+        ],
+        'source': 'CryptoNews',
+        'query': 'cryptonews_rss',
+        'prefilter_keywords': PUBLISHER_PREFILTER_KEYWORDS,
+        'date_ordered': True
+    },
+    {
+        'name': 'Cointelegraph',
+        'urls': ["https://cointelegraph.com/rss"],
+        'source': 'Cointelegraph',
+        'query': 'cointelegraph_rss',
+        'prefilter_keywords': PUBLISHER_PREFILTER_KEYWORDS,
+        'date_ordered': True
+    },
+    {
+        'name': 'Bitcoin.com',
+        'urls': ["https://news.bitcoin.com/feed/"],
+        'source': 'Bitcoin.com',
+        'query': 'bitcoincom_rss',
+        'prefilter_keywords': PUBLISHER_PREFILTER_KEYWORDS,
+        'date_ordered': True
+    }
+]
+
+# Maximum number of simultaneous requests per host when fetching concurrently
+DEFAULT_HOST_CONCURRENCY = {
+    "news.google.com": 4,
+}
+
+# Token bucket settings per domain: refill rate in requests per second and burst size.
+# A domain also covers its subdomains (e.g. "coindesk.com" covers "www.coindesk.com").
+DEFAULT_RATE_LIMITS = {
+    "news.google.com": {"rate": 2.0, "burst": 8},
+    "coindesk.com": {"rate": 0.5, "burst": 2},
+    "cointelegraph.com": {"rate": 0.5, "burst": 2},
+    "cryptonews.com": {"rate": 0.5, "burst": 2},
+    "bitcoin.com": {"rate": 0.5, "burst": 2},
+}
+DEFAULT_RATE_LIMIT = {"rate": 1.0, "burst": 2}
+
+# Consecutive out-of-window items after which a newest-first feed stops being read
+EARLY_STOP_OLD_ITEMS = 3
+
+# General market news language that disqualifies an article
+EXCLUDE_PATTERNS = [
+    "collectively increased", "collectively added", "collectively grew", "collectively expanded",
+    "entities collectively", "treasury entities", "bitcoin entities", "crypto entities",
+    "were added", "was added", "have been added", "has been added",
+    "market analysis", "market commentary", "market overview", "market report",
+    "sector analysis", "industry analysis", "market trend", "market movement",
+    "price analysis", "price movement", "price trend", "technical analysis",
+    "fundamental analysis", "trading volume", "trading activity",
+    "price prediction", "price forecast", "market prediction", "market forecast",
+    "technical indicator", "support level", "resistance level", "moving average",
+    "rsi", "macd", "bollinger", "fibonacci", "elliot wave",
+    "hodl", "diamond hands", "to the moon", "lambo", "wen",
+    "daily update", "weekly update", "monthly update", "quarterly update",
+    "earnings report", "financial results", "revenue report", "profit report"
+]
+
+# Regex patterns that indicate a NEW announcement (balanced approach)
+NEW_ANNOUNCEMENT_PATTERNS = [
+    # Primary announcement patterns (strongest indicators)
+    r'\b(announces|announced)\s+(?:that\s+)?(?:it\s+)?(?:has\s+)?(?:will\s+)?(?:plans\s+to\s+)?(?:to\s+)?(?:add|acquire|buy|purchase|expand|increase)',
+    r'\b(announces|announced)\s+(?:strategic|new|major|significant)\s+(?:acquisition|investment|purchase|addition)',
+    r'\b(announces|announced)\s+(?:plans\s+to\s+)?(?:expand|increase|boost)\s+(?:its\s+)?(?:treasury|holdings|reserves)',
+    r'\b(announces|announced)\s+(?:a\s+)?(?:new\s+)?(?:treasury|investment|acquisition)\s+(?:strategy|initiative|program)',
+    r'\b(launches|launched|reveals|revealed|unveils|unveiled)\s+(?:new\s+)?(?:treasury|investment|acquisition)',
+    r'\b(launches|launched)\s+(?:new\s+)?(?:crypto|digital\s+asset|bitcoin|ethereum)\s+(?:treasury|trading\s+desk|investment)',
+    
+    # Specific company announcements (major companies)
+    r'\b(microstrategy|strategy|tesla|square|coinbase|binance|tether|matador|capital\s+b|sharplink|vivopower|bnc)\s+(?:announces|announced|adds|added|acquires|acquired|buys|bought)',
+    
+    # General company announcements (any company launching/announcing crypto treasury)
+    r'\b(company|corp|inc|ltd|llc|foundation|protocol|corporation)\s+(?:announces|announced|launches|launched)\s+(?:new\s+)?(?:crypto|digital\s+asset|bitcoin|ethereum)\s+(?:treasury|trading\s+desk|investment)',
+    r'\b(announces|announced|launches|launched)\s+(?:new\s+)?(?:crypto|digital\s+asset|bitcoin|ethereum)\s+(?:treasury|trading\s+desk|investment)',
+    
+    # Recent acquisition patterns (within last 24 hours)
+    r'\b(adds|added|acquires|acquired|buys|bought|purchases|purchased)\s+(?:an?\s+)?(?:additional\s+)?(?:more\s+)?(?:bitcoin|btc|ethereum|eth|solana|sol|bnb|altcoin)',
+    r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)',
+    
+    # New initiative patterns
+    r'\b(introduces|introduced|starts|started|begins|began)\s+(?:new\s+)?(?:treasury|investment|acquisition)\s+(?:program|initiative|strategy)',
+    r'\b(implements|implemented|adopts|adopted)\s+(?:new\s+)?(?:treasury|investment)\s+(?:policy|strategy|approach)',
+    
+    # Company action patterns (for major companies)
+    r'\b(microstrategy|strategy|tesla|square|coinbase|binance|tether|matador|capital\s+b|sharplink|vivopower|bnc)\s+(?:adds|added|acquires|acquired|buys|bought|purchases|purchased)',
+    
+    # Treasury expansion patterns
+    r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)\s+(?:with|by|to)\s+(?:bitcoin|btc|ethereum|eth)'
+]
+
+def compile_keyword_matcher(keywords: List[str]) -> re.Pattern:
+    """Compile plain substrings into one regex built from a prefix trie
+    
+    Shared prefixes are matched once (e.g. "treasury b(onds|ills)"), which is
+    what makes one regex scan cheaper than a substring check per keyword.
+    Only presence matters, so a keyword that extends a shorter one is dropped.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node: Dict[str, Any]) -> str:
+        if '' in node:
+            return ''
+        branches = []
+        single_chars = []
+        for char in sorted(node):
+            rest = build(node[char])
+            if rest:
+                branches.append(re.escape(char) + rest)
+            else:
+                single_chars.append(re.escape(char))
+        if len(single_chars) == 1:
+            branches.append(single_chars[0])
+        elif single_chars:
+            branches.append('[' + ''.join(single_chars) + ']')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    
+    return re.compile(build(trie))
+
+class TreasuryClassifier:
+    """Precompiled matcher behind CryptoNewsScraper.is_treasury_expansion
+    
+    Each keyword set becomes one trie-shaped regex, so a single scan answers
+    "does any keyword occur as a substring", and all announcement patterns are
+    combined into one alternation. Results are identical to checking the
+    keywords and patterns one by one.
+    """
+    
+    def __init__(self, crypto_keywords: List[str], treasury_keywords: List[str],
+                 exclude_patterns: List[str] = EXCLUDE_PATTERNS,
+                 announcement_patterns: List[str] = NEW_ANNOUNCEMENT_PATTERNS):
+        self.crypto_matcher = compile_keyword_matcher(crypto_keywords)
+        self.treasury_matcher = compile_keyword_matcher(treasury_keywords)
+        self.exclude_matcher = compile_keyword_matcher(exclude_patterns)
+        self.announcement_matcher = re.compile('|'.join(f'(?:{pattern})' for pattern in announcement_patterns))
+    
+    def is_treasury_expansion(self, text: str) -> bool:
+        """Check lowercased title + description text for a NEW crypto treasury announcement"""
+        # Must contain at least one crypto keyword and one treasury keyword
+        if not self.crypto_matcher.search(text):
+            return False
+        if not self.treasury_matcher.search(text):
+            return False
+        # Reject if it contains general market language
+        if self.exclude_matcher.search(text):
+            return False
+        # MUST contain NEW announcement language
+        return self.announcement_matcher.search(text) is not None
+
+# Prefixes stripped from titles before duplicate detection
+TITLE_PREFIXES = (
+    'bitcoin news today:',
+    'crypto news:',
+    'breaking:',
+    'latest:',
+    'update:',
+    'news:',
+    'trending:'
+)
+
+class TitleNormalizer:
+    """Duplicate-detection fingerprints for article titles
+    
+    Patterns are compiled once and results are memoized per raw title, since the
+    same syndicated headline comes back from many queries and runs.
+    """
+    
+    # Extract company name and key numbers - expanded list
+    COMPANY_PATTERN = re.compile(r'\b(strategy|matador|capital\s+b|bitmine|tether|microstrategy|tesla|square|coinbase|binance|sharplink|vivopower|bnc|trump\s+family)\b')
+    # Patterns like "buys 155 BTC" or "Adds 155 BTC"
+    ACQUISITION_PATTERN = re.compile(r'\b(buys?|adds?|acquires?|purchases?)\s+(\d+)\s*(btc|bitcoin|eth|ethereum|bnb|sol|ada|dot|link|avax|matic)\b')
+    NUMBER_PATTERN = re.compile(r'\b(\d+)\s*(btc|bitcoin|eth|ethereum|bnb|sol|ada|dot|link|avax|matic)\b')
+    ACTION_PATTERN = re.compile(r'\b(announces|announced|adds|added|acquires|acquired|buys|bought|purchases|purchased)\b')
+    # MicroStrategy-specific patterns
+    AMOUNT_PATTERN = re.compile(r'\b(\d+)\s*(btc|bitcoin|eth|ethereum)\b')
+    ANNOUNCEMENT_PATTERNS = (
+        re.compile(r'\b(announces|announced)\s+(?:that\s+)?(?:it\s+)?(?:has\s+)?(?:will\s+)?(?:plans\s+to\s+)?(?:to\s+)?(?:add|acquire|buy|purchase|expand|increase)'),
+        re.compile(r'\b(adds|added|acquires|acquired|buys|bought|purchases|purchased)\s+(?:an?\s+)?(?:additional\s+)?(?:more\s+)?(?:bitcoin|btc|ethereum|eth)'),
+        re.compile(r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)')
+    )
+    ANNOUNCEMENT_ACTION_PATTERN = re.compile(r'\b(announces?|announced|adds?|added|acquires?|acquired|buys?|bought|purchases?|purchased|expands?|expanded|increases?|increased|boosts?|boosted)\b')
+    
+    def __init__(self, cache_size: int = 8192):
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+    
+    def normalize_many(self, titles: List[str]) -> List[str]:
+        """Normalize a batch of titles, reusing cached fingerprints for repeated headlines"""
+        normalize = self.normalize
+        return [normalize(title) for title in titles]
+    
+    def _normalize(self, title: str) -> str:
+        """Normalize title for duplicate detection"""
+        normalized = title.lower()
+        
+        # Remove common prefixes
+        for prefix in TITLE_PREFIXES:
+            if normalized.startswith(prefix):
+                normalized = normalized[len(prefix):].strip()
+        
+        # Remove source suffixes (e.g., " - Cryptopolitan")
+        if ' - ' in normalized:
+            normalized = normalized.split(' - ')[0].strip()
+        
+        # Extract key information (company, amount, action)
+        company_match = self.COMPANY_PATTERN.search(normalized)
+        if not company_match:
+            return normalized
+        
+        company = company_match.group(1)
+        
+        # Look for patterns like "buys 155 BTC" or "Adds 155 BTC" first
+        acquisition_match = self.ACQUISITION_PATTERN.search(normalized)
+        if acquisition_match:
+            return f"{company} {acquisition_match.group(2)} {acquisition_match.group(3)}"
+        
+        # Fallback: the first number that appears with crypto in the title (usually the acquisition amount)
+        number_match = self.NUMBER_PATTERN.search(normalized)
+        if number_match:
+            return f"{company} {number_match.group(1)} {number_match.group(2)}"
+        
+        # For announcements without specific numbers, use company + key action
+        action_match = self.ACTION_PATTERN.search(normalized)
+        if action_match:
+            return f"{company} {action_match.group(1)}"
+        
+        # Special handling for MicroStrategy to avoid duplicates
+        if company == "strategy" or company == "microstrategy":
+            # Look for specific amounts to differentiate
+            amount_match = self.AMOUNT_PATTERN.search(normalized)
+            if amount_match:
+                return f"microstrategy {amount_match.group(1)} {amount_match.group(2)}"
+            
+            # Look for specific announcement patterns
+            for pattern in self.ANNOUNCEMENT_PATTERNS:
+                if pattern.search(normalized):
+                    action_match = self.ANNOUNCEMENT_ACTION_PATTERN.search(normalized)
+                    if action_match:
+                        return f"microstrategy {action_match.group(1)}"
+            
+            return "microstrategy announcement"
+        
+        return normalized
+
+# Article type keywords, matching getArticleType in static/js/dashboard.js
+PRIMARY_EXPANSION_KEYWORDS = [
+    'buys', 'bought', 'purchases', 'purchased', 'purchase',
+    'acquires', 'acquired', 'acquisition',
+    'adds', 'added', 'addition'
+]
+SECONDARY_EXPANSION_KEYWORDS = [
+    'expands', 'expanded', 'expansion', 'increases', 'increased', 'increase',
+    'boosts', 'boosted', 'boost', 'grows', 'grew', 'growth'
+]
+PRIMARY_ANNOUNCEMENT_KEYWORDS = [
+    'announces', 'announced', 'announcement',
+    'launches', 'launched', 'launch',
+    'reveals', 'revealed', 'reveal',
+    'unveils', 'unveiled', 'unveil'
+]
+SECONDARY_ANNOUNCEMENT_KEYWORDS = [
+    'new', 'fresh', 'latest', 'recent', 'updates', 'updated',
+    'strategic', 'investment', 'portfolio'
+]
+
+# Coins counted in coin mention statistics
+COIN_PATTERNS = {
+    'BTC': r'\b(?:bitcoin|btc)\b',
+    'ETH': r'\b(?:ethereum|ether|eth)\b',
+    'SOL': r'\b(?:solana|sol)\b',
+    'XRP': r'\b(?:ripple|xrp)\b',
+    'BNB': r'\b(?:binance coin|bnb)\b',
+    'DOGE': r'\b(?:dogecoin|doge)\b',
+    'ADA': r'\b(?:cardano|ada)\b',
+    'LTC': r'\b(?:litecoin|ltc)\b',
+    'AVAX': r'\b(?:avalanche|avax)\b',
+    'WLFI': r'\bwlfi\b',
+}
+
+# Article URL extraction from Google News descriptions and redirect links
+HREF_PATTERN = re.compile(r'href="([^"]+)"')
+REDIRECT_URL_PATTERN = re.compile(r'url=([^&]+)')
+
+def parse_published(article: Dict[str, Any]) -> datetime:
+    """Timezone-aware publication time of a stored article"""
+    published = datetime.fromisoformat(article['published'])
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+_ARTICLE_TYPE_MATCHERS = [compile_keyword_matcher(keywords) for keywords in (
+    PRIMARY_EXPANSION_KEYWORDS, SECONDARY_EXPANSION_KEYWORDS,
+    PRIMARY_ANNOUNCEMENT_KEYWORDS, SECONDARY_ANNOUNCEMENT_KEYWORDS
+)]
+_COIN_MATCHERS = {coin: re.compile(pattern) for coin, pattern in COIN_PATTERNS.items()}
+
+def get_article_type(article: Dict[str, Any]) -> str:
+    """Classify an article as 'Expansion & Announcement', 'Expansion', 'New Announcement' or 'Treasury Activity'"""
+    text = f"{article.get('title', '')} {article.get('description') or ''}".lower()
+    primary_expansion, secondary_expansion, primary_announcement, secondary_announcement = (
+        matcher.search(text) is not None for matcher in _ARTICLE_TYPE_MATCHERS
+    )
+    
+    # Determine type based on priority
+    if primary_expansion and primary_announcement:
+        return 'Expansion & Announcement'
+    elif primary_expansion:
+        return 'Expansion'
+    elif primary_announcement:
+        return 'New Announcement'
+    elif secondary_expansion and secondary_announcement:
+        return 'Treasury Activity'
+    elif secondary_expansion:
+        return 'Expansion'
+    elif secondary_announcement:
+        return 'New Announcement'
+    return 'Treasury Activity'
+
+def get_coin_mentions(article: Dict[str, Any]) -> List[str]:
+    """Coins (from COIN_PATTERNS) mentioned in an article's title or description"""
+    text = f"{article.get('title', '')} {article.get('description') or ''}".lower()
+    return [coin for coin, matcher in _COIN_MATCHERS.items() if matcher.search(text)]
+
+# Holding amounts such as "155 BTC", "10,000 ETH" or "$18 million"
+COIN_AMOUNT_PATTERN = re.compile(r'\b(\d[\d,]*(?:\.\d+)?)\s*(btc|bitcoin|eth|ethereum|ether|sol|solana|xrp|bnb|doge|ada|ltc|avax)\b')
+USD_AMOUNT_PATTERN = re.compile(r'\$\s?(\d[\d,]*(?:\.\d+)?)\s*(million|billion|bn|m|b|k)?\b')
+COIN_UNITS = {
+    'btc': 'BTC', 'bitcoin': 'BTC', 'eth': 'ETH', 'ethereum': 'ETH', 'ether': 'ETH',
+    'sol': 'SOL', 'solana': 'SOL', 'xrp': 'XRP', 'bnb': 'BNB', 'doge': 'DOGE',
+    'ada': 'ADA', 'ltc': 'LTC', 'avax': 'AVAX'
+}
+USD_SCALES = {'million': 'million', 'm': 'million', 'billion': 'billion', 'bn': 'billion', 'b': 'billion', 'k': 'thousand'}
+
+# Known treasury companies for get_company, matched on the original-case text. Unlike the
+# dedup COMPANY_PATTERN, "Strategy" must be capitalized and read as the company (followed by
+# a verb, a possessive or its ticker), so "bitcoin treasury strategy" is not attributed to it.
+COMPANY_NAME_PATTERN = re.compile(
+    r"\b((?i:microstrategy|matador|capital\s+b|bitmine|tether|tesla|square|coinbase|binance|"
+    r"sharplink|vivopower|bnc|trump\s+family)"
+    r"|Strategy(?=\s*\((?i:(?:nasdaq:\s*)?mstr)\)|'s\b|\s+(?i:buys|bought|adds|added|acquires|acquired|"
+    r"purchases|purchased|announces|announced|expands|raises|holds|now|files|reports)\b))\b"
+)
+
+def get_company(article: Dict[str, Any]) -> Optional[str]:
+    """The known treasury company named in the title, else the description"""
+    for text in (article.get('title', ''), article.get('description') or ''):
+        match = COMPANY_NAME_PATTERN.search(text)
+        if match:
+            return ' '.join(match.group(1).lower().split())
+    return None
+
+def get_amount(article: Dict[str, Any]) -> Optional[str]:
+    """The first coin amount ("155 BTC") in the title or description, else the first dollar amount"""
+    text = f"{article.get('title', '')} {article.get('description') or ''}".lower()
+    match = COIN_AMOUNT_PATTERN.search(text)
+    if match:
+        return f"{match.group(1)} {COIN_UNITS[match.group(2)]}"
+    match = USD_AMOUNT_PATTERN.search(text)
+    if match:
+        return f"${match.group(1)} {USD_SCALES.get(match.group(2), '')}".strip()
+    return None
+
+def annotate_article(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Store article_type, company, coins and amount on the article (in place) and return it"""
+    article['article_type'] = get_article_type(article)
+    article['company'] = get_company(article)
+    article['coins'] = get_coin_mentions(article)
+    article['amount'] = get_amount(article)
+    return article
+
+def ensure_annotated(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Annotate articles saved before classification moved to ingest"""
+    for article in articles:
+        if 'article_type' not in article:
+            annotate_article(article)
+    return articles
+
+# Connection pool size per host for the shared HTTP session
+DEFAULT_POOL_SIZES = {
+    "news.google.com": 8,
+}
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# How save_to_json writes the news file: 'json' (minified), 'orjson' or 'msgpack', optionally gzipped.
+# Readers detect the format, so this can be changed without touching the front ends.
+NEWS_FILE_FORMAT = "json"
+NEWS_FILE_COMPRESS = False
+
+# Consolidated Google News queries written by query_planner.py; used instead of
+# GOOGLE_NEWS_QUERIES when present and planned from the current query list
+QUERY_PLAN_FILE = "query_plan.json"
+
+def load_query_plan(filename: str = QUERY_PLAN_FILE) -> Optional[List[str]]:
+    """Load the planned Google News queries, or None if there is no usable plan"""
+    if not filename:
+        return None
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not load query plan {filename}: {e}")
+        return None
+    
+    # A plan made for a different query list would silently drop the new queries
+    if plan.get('source_queries') != GOOGLE_NEWS_QUERIES or not plan.get('queries'):
+        logger.warning(f"Ignoring query plan {filename}: it was made for a different query list")
+        return None
+    logger.info(f"Using query plan {filename}: {len(plan['queries'])} queries "
+                f"instead of {len(GOOGLE_NEWS_QUERIES)} (recall {plan.get('recall')})")
+    return list(plan['queries'])
+
+def create_http_session(pool_sizes: Optional[Dict[str, int]] = None, default_pool_size: int = 4,
+                        retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+    """Create a keep-alive session with per-host connection pools, compression and retry with backoff"""
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    
+    def make_adapter(pool_size: int) -> HTTPAdapter:
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            # Hand the last response back so raise_for_status() reports it as before
+            raise_on_status=False
+        )
+        return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session.mount('http://', make_adapter(default_pool_size))
+    session.mount('https://', make_adapter(default_pool_size))
+    
+    sizes = dict(DEFAULT_POOL_SIZES)
+    if pool_sizes:
+        sizes.update(pool_sizes)
+    for host, pool_size in sizes.items():
+        adapter = make_adapter(pool_size)
+        session.mount(f'https://{host}/', adapter)
+        session.mount(f'http://{host}/', adapter)
+    
+    return session
+
+class TokenBucket:
+    """Thread-safe token bucket that refills at a fixed rate up to a burst size"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # The token is borrowed from the future, so later callers queue behind this one
+            return -self.tokens / self.rate
+
+class HostRateLimiter:
+    """Per-host token bucket rate limiter that records how long each host was throttled
+    
+    Any object with the same acquire(host) -> float method can be passed to
+    CryptoNewsScraper instead, e.g. one backed by a store shared between processes.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 default_limit: Optional[Dict[str, float]] = None):
+        self.limits = dict(DEFAULT_RATE_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_limit = default_limit or DEFAULT_RATE_LIMIT
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+    
+    def _bucket_key(self, host: str) -> str:
+        """Map a host to the configured domain it falls under, or to itself"""
+        for domain in self.limits:
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return host
+    
+    def acquire(self, host: str) -> float:
+        """Block until a request to host is allowed and return the seconds spent waiting"""
+        key = self._bucket_key(host.lower())
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                limit = self.limits.get(key, self.default_limit)
+                bucket = TokenBucket(limit["rate"], limit["burst"])
+                self.buckets[key] = bucket
+            stats = self.stats.setdefault(key, {"requests": 0, "throttled_requests": 0, "throttled_seconds": 0.0})
+        
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        
+        with self.lock:
+            stats["requests"] += 1
+            if wait > 0:
+                stats["throttled_requests"] += 1
+                stats["throttled_seconds"] += wait
+        return wait
+    
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get a copy of the per-host request and throttling counters"""
+        with self.lock:
+            return {host: dict(stats) for host, stats in self.stats.items()}
+
+class HTTPValidatorCache:
+    """Persistent per-URL cache of ETag/Last-Modified validators and the articles parsed from each feed
+    
+    Counters: hits (a conditional request was sent), misses (no validators were
+    cached for the URL) and not_modified (the server answered 304).
+    """
+    
+    def __init__(self, filename: str = "http_cache.json"):
+        self.filename = filename
+        self.entries = {}
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0}
+        self.lock = threading.Lock()
+        self.load()
+    
+    def load(self):
+        """Load cached validators from disk"""
+        if not self.filename:
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('entries', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load HTTP validator cache {self.filename}: {e}")
+    
+    def save(self):
+        """Write cached validators to disk, atomically so an interrupted write can't corrupt the file"""
+        if not self.filename:
+            return
+        try:
+            with self.lock:
+                data = json.dumps({'entries': self.entries}, ensure_ascii=False)
+            atomic_write(self.filename, data.encode('utf-8'))
+        except Exception as e:
+            logger.error(f"Error saving HTTP validator cache: {e}")
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Get the If-None-Match/If-Modified-Since headers for a URL"""
+        headers = {}
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+            if headers:
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        return headers
+    
+    def record_not_modified(self, url: str) -> List[Dict[str, Any]]:
+        """Count a 304 response and return the articles cached for the URL"""
+        with self.lock:
+            self.stats["not_modified"] += 1
+            return list(self.entries.get(url, {}).get('articles', []))
+    
+    def store(self, url: str, response: requests.Response, articles: List[Dict[str, Any]]):
+        """Remember the validators of a full response together with the articles parsed from it"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self.lock:
+            if etag or last_modified:
+                self.entries[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'articles': articles
+                }
+            else:
+                self.entries.pop(url, None)
+    
+    def clear(self):
+        """Forget every cached validator, so the next request for each feed is a full download"""
+        with self.lock:
+            self.entries = {}
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get a copy of the hit/miss/304 counters"""
+        with self.lock:
+            return dict(self.stats)
+
+class SeenItemIndex:
+    """Persistent index of feed items that have already been processed
+    
+    Keys (item GUID, else link) live in an in-memory hash set backed by SQLite and
+    expire ttl_hours after they were first seen. The merged article set is stored
+    alongside, so it survives restarts.
+    """
+    
+    def __init__(self, filename: str = "scraper_state.db", ttl_hours: int = 48):
+        self.ttl = timedelta(hours=ttl_hours)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filename or ':memory:', check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # True for a new (or lost and recreated) database, which holds no articles yet
+        self.created = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'seen_items'").fetchone() is None
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_items ("
+            "item_key TEXT PRIMARY KEY, first_seen TEXT NOT NULL, accepted INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+        self.keys = {row[0] for row in self.conn.execute("SELECT item_key FROM seen_items")}
+        # Keys taken by a feed in the current run but not saved yet
+        self.claimed = set()
+        self.evict_expired()
+    
+    def __contains__(self, item_key: str) -> bool:
+        return item_key in self.keys
+    
+    def claim(self, item_key: str) -> bool:
+        """Take an item for the current run; False if it was seen before or another feed took it first
+        
+        Overlapping feeds in one run then process (and count) a shared item only once.
+        """
+        with self.lock:
+            if item_key in self.keys or item_key in self.claimed:
+                return False
+            self.claimed.add(item_key)
+            return True
+    
+    def release_claims(self):
+        """Forget the current run's claims once its items are saved (or the run failed)"""
+        with self.lock:
+            self.claimed.clear()
+    
+    def evict_expired(self):
+        """Drop entries first seen more than ttl_hours ago"""
+        expires_before = (datetime.now(timezone.utc) - self.ttl).isoformat()
+        with self.lock:
+            expired = [row[0] for row in self.conn.execute(
+                "SELECT item_key FROM seen_items WHERE first_seen < ?", (expires_before,))]
+            if expired:
+                self.conn.execute("DELETE FROM seen_items WHERE first_seen < ?", (expires_before,))
+                self.conn.commit()
+                self.keys.difference_update(expired)
+    
+    def save_articles(self, articles: List[Dict[str, Any]], records: Optional[List[Tuple[str, bool]]] = None):
+        """Store the merged article set, plus the (item key, accepted) pairs it was built from
+        
+        Both are written in one transaction, so an item is never marked seen
+        without its article being stored.
+        """
+        data = json.dumps(articles, ensure_ascii=False)
+        first_seen = datetime.now(timezone.utc).isoformat()
+        rows = [(key, first_seen, int(accepted)) for key, accepted in records or []]
+        with self.lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO state VALUES ('articles', ?)", (data,))
+                self.conn.executemany("INSERT OR IGNORE INTO seen_items VALUES (?, ?, ?)", rows)
+            self.keys.update(key for key, _, _ in rows)
+    
+    def load_articles(self, cutoff_time: datetime) -> List[Dict[str, Any]]:
+        """Get the stored articles published after cutoff_time"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM state WHERE name = 'articles'").fetchone()
+        if row is None:
+            return []
+        return [article for article in json.loads(row[0]) if parse_published(article) >= cutoff_time]
+
+class ResolvedURLCache:
+    """Persistent, size-bounded map of RSS redirect link -> resolved article URL
+    
+    Failures are cached as None for negative_ttl_hours so broken links are not
+    retried on every run. The least recently used entries are dropped beyond
+    max_entries.
+    """
+    
+    def __init__(self, filename: str = "scraper_state.db", max_entries: int = 10000,
+                 negative_ttl_hours: int = 6):
+        self.max_entries = max_entries
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filename or ':memory:', check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS resolved_urls ("
+            "rss_link TEXT PRIMARY KEY, resolved_url TEXT, resolved_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+        self.entries = OrderedDict()
+        for rss_link, resolved_url, resolved_at in self.conn.execute(
+                "SELECT rss_link, resolved_url, resolved_at FROM resolved_urls ORDER BY resolved_at"):
+            self.entries[rss_link] = (resolved_url, datetime.fromisoformat(resolved_at))
+        self.stats = {"hits": 0, "misses": 0}
+    
+    def get(self, rss_link: str) -> Tuple[bool, Optional[str]]:
+        """Return (found, resolved URL or None for a cached failure)"""
+        with self.lock:
+            entry = self.entries.get(rss_link)
+            if entry is not None:
+                resolved_url, resolved_at = entry
+                if resolved_url is not None or datetime.now(timezone.utc) - resolved_at < self.negative_ttl:
+                    self.entries.move_to_end(rss_link)
+                    self.stats["hits"] += 1
+                    return True, resolved_url
+            self.stats["misses"] += 1
+            return False, None
+    
+    def put(self, rss_link: str, resolved_url: Optional[str]):
+        """Cache a resolved URL, or None for a failed resolution"""
+        resolved_at = datetime.now(timezone.utc)
+        with self.lock:
+            self.entries[rss_link] = (resolved_url, resolved_at)
+            self.entries.move_to_end(rss_link)
+            self.conn.execute("INSERT OR REPLACE INTO resolved_urls VALUES (?, ?, ?)",
+                              (rss_link, resolved_url, resolved_at.isoformat()))
+            evicted = []
+            while len(self.entries) > self.max_entries:
+                evicted.append((self.entries.popitem(last=False)[0],))
+            if evicted:
+                self.conn.executemany("DELETE FROM resolved_urls WHERE rss_link = ?", evicted)
+            self.conn.commit()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get a copy of the hit/miss counters"""
+        with self.lock:
+            return dict(self.stats)
+
+class ArticleHistory:
+    """Long-term article archive in SQLite (WAL mode), queried page by page
+    
+    Accepted articles are kept beyond the 24-hour window of news_data. Published
+    time is stored as a UTC ISO string so it sorts chronologically, and indexes on
+    published time, source, query, type and title fingerprint keep filtered, paginated
+    queries fast on large archives. Pages are fetched with a keyset cursor.
+    """
+    
+    def __init__(self, filename: str = "article_history.db"):
+        self.lock = threading.Lock()
+        self.title_normalizer = TitleNormalizer()
+        self.conn = sqlite3.connect(filename or ':memory:', check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "id INTEGER PRIMARY KEY, link TEXT NOT NULL UNIQUE, title TEXT NOT NULL, "
+            "description TEXT, published TEXT NOT NULL, source TEXT, query TEXT, "
+            "article_type TEXT, fingerprint TEXT, first_seen TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        for column in ("published", "source, published", "query, published", "article_type, published", "fingerprint"):
+            name = "idx_articles_" + column.replace(", ", "_")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON articles ({column})")
+        self.has_fts = self._create_search_index()
+        self.conn.commit()
+    
+    def _create_search_index(self) -> bool:
+        """Create the FTS5 index over title and description; False if FTS5 is unavailable
+        
+        The index is an external-content table kept in sync by triggers, so every
+        insert, update or delete of an article updates it in the same transaction.
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'").fetchone()
+        try:
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+                "title, description, content='articles', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 not available, search falls back to LIKE: {e}")
+            return False
+        self.conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+        """)
+        if not exists:
+            # Index articles archived before the search index existed
+            self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        return True
+    
+    def _row(self, article: Dict[str, Any], first_seen: str) -> Tuple:
+        try:
+            published = parse_published(article).astimezone(timezone.utc).isoformat()
+        except Exception:
+            published = first_seen
+        return (
+            article['link'], article.get('title', ''), article.get('description', ''), published,
+            article.get('source'), article.get('query'), article.get('article_type') or get_article_type(article),
+            self.title_normalizer.normalize(article.get('title', '')),
+            first_seen, json.dumps(article, ensure_ascii=False)
+        )
+    
+    def add_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """Archive articles not stored yet (by link); returns how many were added"""
+        if not articles:
+            return 0
+        first_seen = datetime.now(timezone.utc).isoformat()
+        rows = [self._row(article, first_seen) for article in articles if article.get('link')]
+        with self.lock:
+            # rowcount counts only the inserted articles; total_changes would include the FTS trigger writes
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (link, title, description, published, source, query, "
+                "article_type, fingerprint, first_seen, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+            return cursor.rowcount
+    
+    @staticmethod
+    def _to_utc_iso(value: Optional[Any]) -> Optional[str]:
+        if value is None or value == '':
+            return None
+        if not isinstance(value, datetime):
+            value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    
+    def _where(self, start=None, end=None, source=None, article_type=None, query=None,
+               fingerprint=None) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        start, end = self._to_utc_iso(start), self._to_utc_iso(end)
+        for clause, value in (("published >= ?", start), ("published < ?", end), ("source = ?", source),
+                              ("article_type = ?", article_type), ("query = ?", query),
+                              ("fingerprint = ?", fingerprint)):
+            if value:
+                clauses.append(clause)
+                params.append(value)
+        return clauses, params
+    
+    @staticmethod
+    def encode_cursor(published: str, row_id: int) -> str:
+        return f"{published}|{row_id}"
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        published, _, row_id = cursor.rpartition('|')
+        if not published or not row_id.isdigit():
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return published, int(row_id)
+    
+    def query_articles(self, start=None, end=None, source: Optional[str] = None,
+                       article_type: Optional[str] = None, query: Optional[str] = None,
+                       fingerprint: Optional[str] = None,
+                       limit: int = 50, cursor: Optional[str] = None, page: Optional[int] = None,
+                       with_total: bool = True) -> Dict[str, Any]:
+        """Get one page of archived articles, newest first
+        
+        Filters are optional: start/end bound the published time (datetimes or ISO
+        strings, end exclusive); source, article_type and query match exactly.
+        fingerprint (returned with every article) finds all archived coverage of
+        the same story, i.e. the articles the title dedup treats as duplicates.
+        Pass the returned next_cursor to get the following page; page (1-based)
+        is also accepted for jumping directly, at the cost of an OFFSET scan.
+        """
+        clauses, params = self._where(start, end, source, article_type, query, fingerprint)
+        count_sql = "SELECT COUNT(*) FROM articles" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        count_params = list(params)
+        
+        offset = 0
+        if cursor:
+            published, row_id = self.decode_cursor(cursor)
+            clauses.append("(published < ? OR (published = ? AND id < ?))")
+            params.extend([published, published, row_id])
+        elif page and page > 1:
+            offset = (page - 1) * limit
+        
+        sql = ("SELECT id, published, article_type, fingerprint, data FROM articles" +
+               (" WHERE " + " AND ".join(clauses) if clauses else "") +
+               " ORDER BY published DESC, id DESC LIMIT ? OFFSET ?")
+        with self.lock:
+            rows = self.conn.execute(sql, params + [limit + 1, offset]).fetchall()
+            total = self.conn.execute(count_sql, count_params).fetchone()[0] if with_total else None
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        articles = []
+        for row in rows:
+            article = json.loads(row['data'])
+            article.setdefault('article_type', row['article_type'])
+            article['fingerprint'] = row['fingerprint']
+            articles.append(article)
+        return {
+            'articles': articles,
+            'total': total,
+            'next_cursor': self.encode_cursor(rows[-1]['published'], rows[-1]['id']) if has_more else None
+        }
+    
+    @staticmethod
+    def _search_terms(text: str) -> List[str]:
+        return re.findall(r'\w+', text.lower())
+    
+    def search(self, text: str, limit: int = 20, page: int = 1) -> Dict[str, Any]:
+        """Full-text search over titles and descriptions, best matches first
+        
+        Every term must match, as a word prefix ("sharp" finds "SharpLink").
+        Results are ranked by bm25 with title matches weighted above description
+        matches, newest first among equal scores.
+        """
+        terms = self._search_terms(text)
+        if not terms:
+            return {'articles': [], 'total': 0, 'page': page}
+        offset = (max(page, 1) - 1) * limit
+        
+        if self.has_fts:
+            match = " ".join(f'"{term}"*' for term in terms)
+            sql = ("SELECT a.article_type, a.data FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                   "WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts, 10.0, 1.0), a.published DESC "
+                   "LIMIT ? OFFSET ?")
+            count_sql = "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH ?"
+            params = [match]
+        else:
+            # No ranking without FTS5; every term must appear in the title or description
+            clauses = ["(title LIKE ? OR description LIKE ?)"] * len(terms)
+            where = " AND ".join(clauses)
+            sql = f"SELECT article_type, data FROM articles WHERE {where} ORDER BY published DESC LIMIT ? OFFSET ?"
+            count_sql = f"SELECT COUNT(*) FROM articles WHERE {where}"
+            params = [pattern for term in terms for pattern in (f"%{term}%", f"%{term}%")]
+        
+        with self.lock:
+            rows = self.conn.execute(sql, params + [limit, offset]).fetchall()
+            total = self.conn.execute(count_sql, params).fetchone()[0]
+        
+        articles = []
+        for row in rows:
+            article = json.loads(row['data'])
+            article.setdefault('article_type', row['article_type'])
+            articles.append(article)
+        return {'articles': articles, 'total': total, 'page': max(page, 1)}
+    
+    def get_sources(self) -> List[str]:
+        """Distinct sources in the archive, for filter choices"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT DISTINCT source FROM articles WHERE source IS NOT NULL ORDER BY source")]
+    
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
 class CryptoNewsScraper:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, host_concurrency: Optional[Dict[str, int]] = None,
+                 default_host_concurrency: int = 2, rate_limiter: Optional[HostRateLimiter] = None,
+                 validator_cache: Optional[HTTPValidatorCache] = None,
+                 session: Optional[requests.Session] = None,
+                 feeds: Optional[List[Dict[str, Any]]] = None,
+                 seen_index: Optional[SeenItemIndex] = None,
+                 url_cache: Optional[ResolvedURLCache] = None,
+                 history: Optional[ArticleHistory] = None,
+                 queries: Optional[List[str]] = None,
+                 query_plan_file: Optional[str] = QUERY_PLAN_FILE):
         self.base_url = "https://news.google.com/rss"
+        # Explicit queries win over the planned ones, which win over the full list
+        if queries is None:
+            queries = load_query_plan(query_plan_file)
+        self.queries = list(queries if queries is not None else GOOGLE_NEWS_QUERIES)
+        # Concurrent fetching settings
+        self.max_workers = max_workers
+        self.host_concurrency = dict(DEFAULT_HOST_CONCURRENCY)
+        if host_concurrency:
+            self.host_concurrency.update(host_concurrency)
+        self.default_host_concurrency = default_host_concurrency
+        self._host_semaphores = {}
+        self._host_semaphores_lock = threading.Lock()
+        # Politeness control shared by every request the scraper makes
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Shared keep-alive session; pass your own to point the scraper at a test server
+        self.session = session or create_http_session()
+        # ETag/Last-Modified validators so unchanged feeds are answered with 304
+        self.validator_cache = validator_cache if validator_cache is not None else HTTPValidatorCache()
         # Keywords for treasury expansions and new announcements
         self.expansion_keywords = [
             "expands", "expanded", "expansion", "increases", "increased", "increase",
@@ -42,8 +1128,82 @@ class CryptoNewsScraper:
             "binance coin", "bnb", "ripple", "xrp", "litecoin", "ltc", "dogecoin", "doge",
             "uniswap", "uni", "aave", "compound", "maker", "mkr", "sushi", "sushi"
         ]
-        self.news_data = []
+        # Keyword sets and patterns compiled once for is_treasury_expansion
+        self.classifier = TreasuryClassifier(self.crypto_keywords, self.treasury_keywords)
+        self.title_normalizer = TitleNormalizer()
+        # Publisher feeds fetched alongside the Google News queries
+        self.feeds = [dict(feed) for feed in (feeds if feeds is not None else RSS_FEEDS)]
+        self._keyword_matchers = {}
+        self._keyword_matchers_lock = threading.Lock()
+        # Items processed in earlier runs are skipped; their articles are merged back in
+        self.seen_index = seen_index if seen_index is not None else SeenItemIndex()
+        if self.seen_index.created:
+            # A 304 replays only the new articles of the last full response; without the
+            # stored article set the rest of the feed would be missing until it changes
+            self.validator_cache.clear()
+        # Seen-item records from fetch_feed, written together with the next merge
+        self._pending_seen = []
+        self._pending_seen_lock = threading.Lock()
+        self._news_lock = threading.Lock()
+        # Google News redirect link -> article URL, so redirects are followed once
+        self.url_cache = url_cache if url_cache is not None else ResolvedURLCache()
+        # Every accepted article is archived here, beyond the 24-hour window of news_data
+        self.history = history if history is not None else ArticleHistory()
+        self.news_data = ensure_annotated(self.seen_index.load_articles(self._get_cutoff_time()))
+        
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore capping concurrent requests to the URL's host"""
+        host = urlparse(url).netloc.lower()
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                limit = self.host_concurrency.get(host, self.default_host_concurrency)
+                semaphore = threading.BoundedSemaphore(max(1, limit))
+                self._host_semaphores[host] = semaphore
+            return semaphore
+    
+    def _http_get(self, url: str, conditional: bool = False, **kwargs) -> requests.Response:
+        """GET a URL while respecting the per-host rate limit and concurrency cap
         
+        With conditional=True the cached validators for the URL are sent, so the
+        caller must handle a 304 Not Modified response.
+        """
+        if conditional:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(self.validator_cache.conditional_headers(url))
+            kwargs['headers'] = headers
+        self.rate_limiter.acquire(urlparse(url).netloc)
+        with self._get_host_semaphore(url):
+            return self.session.get(url, **kwargs)
+    
+    def _http_head(self, url: str, **kwargs) -> requests.Response:
+        """HEAD a URL while respecting the per-host rate limit and concurrency cap"""
+        self.rate_limiter.acquire(urlparse(url).netloc)
+        with self._get_host_semaphore(url):
+            return self.session.head(url, **kwargs)
+    
+    def _not_modified_articles(self, url: str, cutoff_time: datetime) -> List[Dict[str, Any]]:
+        """Return the cached articles of an unchanged feed that are still after the cutoff"""
+        articles = []
+        for article in self.validator_cache.record_not_modified(url):
+            try:
+                if parse_published(article) >= cutoff_time:
+                    articles.append(article)
+            except Exception:
+                continue
+        logger.info(f"Feed not modified, reusing {len(articles)} cached articles: {url}")
+        return articles
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get the conditional GET cache hit/miss/304 counters"""
+        return self.validator_cache.get_stats()
+    
+    def get_throttle_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get per-host request counts and the total time requests were throttled"""
+        if hasattr(self.rate_limiter, 'get_stats'):
+            return self.rate_limiter.get_stats()
+        return {}
+    
     def get_google_news_rss_url(self, query: str) -> str:
         """Generate Google News RSS URL for a specific query"""
         encoded_query = requests.utils.quote(query)
@@ -52,170 +1212,17 @@ class CryptoNewsScraper:
     def is_treasury_expansion(self, title: str, description: str) -> bool:
         """Check if the news article is about NEW crypto treasury announcements only"""
         text = f"{title} {description}".lower()
-        
-        # Must contain at least one crypto keyword
-        has_crypto = any(keyword in text for keyword in self.crypto_keywords)
-        if not has_crypto:
-            return False
-            
-        # Must contain at least one treasury keyword
-        has_treasury = any(keyword in text for keyword in self.treasury_keywords)
-        if not has_treasury:
-            return False
-            
-        # EXCLUDE general market news patterns
-        exclude_patterns = [
-            "collectively increased", "collectively added", "collectively grew", "collectively expanded",
-            "entities collectively", "treasury entities", "bitcoin entities", "crypto entities",
-            "were added", "was added", "have been added", "has been added",
-            "market analysis", "market commentary", "market overview", "market report",
-            "sector analysis", "industry analysis", "market trend", "market movement",
-            "price analysis", "price movement", "price trend", "technical analysis",
-            "fundamental analysis", "trading volume", "trading activity",
-            "price prediction", "price forecast", "market prediction", "market forecast",
-            "technical indicator", "support level", "resistance level", "moving average",
-            "rsi", "macd", "bollinger", "fibonacci", "elliot wave",
-            "hodl", "diamond hands", "to the moon", "lambo", "wen",
-            "daily update", "weekly update", "monthly update", "quarterly update",
-            "earnings report", "financial results", "revenue report", "profit report"
-        ]
-        
-        # Reject if it contains general market language
-        if any(pattern in text for pattern in exclude_patterns):
-            return False
-            
-        # MUST contain NEW announcement patterns (balanced approach)
-        new_announcement_patterns = [
-            # Primary announcement patterns (strongest indicators)
-            r'\b(announces|announced)\s+(?:that\s+)?(?:it\s+)?(?:has\s+)?(?:will\s+)?(?:plans\s+to\s+)?(?:to\s+)?(?:add|acquire|buy|purchase|expand|increase)',
-            r'\b(announces|announced)\s+(?:strategic|new|major|significant)\s+(?:acquisition|investment|purchase|addition)',
-            r'\b(announces|announced)\s+(?:plans\s+to\s+)?(?:expand|increase|boost)\s+(?:its\s+)?(?:treasury|holdings|reserves)',
-            r'\b(announces|announced)\s+(?:a\s+)?(?:new\s+)?(?:treasury|investment|acquisition)\s+(?:strategy|initiative|program)',
-            r'\b(launches|launched|reveals|revealed|unveils|unveiled)\s+(?:new\s+)?(?:treasury|investment|acquisition)',
-            r'\b(launches|launched)\s+(?:new\s+)?(?:crypto|digital\s+asset|bitcoin|ethereum)\s+(?:treasury|trading\s+desk|investment)',
-            
-            # Specific company announcements (major companies)
-            r'\b(microstrategy|strategy|tesla|square|coinbase|binance|tether|matador|capital\s+b|sharplink|vivopower|bnc)\s+(?:announces|announced|adds|added|acquires|acquired|buys|bought)',
-            
-            # General company announcements (any company launching/announcing crypto treasury)
-            r'\b(company|corp|inc|ltd|llc|foundation|protocol|corporation)\s+(?:announces|announced|launches|launched)\s+(?:new\s+)?(?:crypto|digital\s+asset|bitcoin|ethereum)\s+(?:treasury|trading\s+desk|investment)',
-            r'\b(announces|announced|launches|launched)\s+(?:new\s+)?(?:crypto|digital\s+asset|bitcoin|ethereum)\s+(?:treasury|trading\s+desk|investment)',
-            
-            # Recent acquisition patterns (within last 24 hours)
-            r'\b(adds|added|acquires|acquired|buys|bought|purchases|purchased)\s+(?:an?\s+)?(?:additional\s+)?(?:more\s+)?(?:bitcoin|btc|ethereum|eth|solana|sol|bnb|altcoin)',
-            r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)',
-            
-            # New initiative patterns
-            r'\b(introduces|introduced|starts|started|begins|began)\s+(?:new\s+)?(?:treasury|investment|acquisition)\s+(?:program|initiative|strategy)',
-            r'\b(implements|implemented|adopts|adopted)\s+(?:new\s+)?(?:treasury|investment)\s+(?:policy|strategy|approach)',
-            
-            # Company action patterns (for major companies)
-            r'\b(microstrategy|strategy|tesla|square|coinbase|binance|tether|matador|capital\s+b|sharplink|vivopower|bnc)\s+(?:adds|added|acquires|acquired|buys|bought|purchases|purchased)',
-            
-            # Treasury expansion patterns
-            r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)\s+(?:with|by|to)\s+(?:bitcoin|btc|ethereum|eth)'
-        ]
-        
-        # Check if it contains NEW announcement language
-        import re
-        for pattern in new_announcement_patterns:
-            if re.search(pattern, text):
-                return True
-                
-        return False
+        return self.classifier.is_treasury_expansion(text)
     
 
     
     def normalize_title(self, title: str) -> str:
         """Normalize title for duplicate detection"""
-        # Remove common prefixes and suffixes
-        normalized = title.lower()
-        
-        # Remove common prefixes
-        prefixes_to_remove = [
-            'bitcoin news today:',
-            'crypto news:',
-            'breaking:',
-            'latest:',
-            'update:',
-            'news:',
-            'trending:'
-        ]
-        
-        for prefix in prefixes_to_remove:
-            if normalized.startswith(prefix):
-                normalized = normalized[len(prefix):].strip()
-        
-        # Remove source suffixes (e.g., " - Cryptopolitan")
-        if ' - ' in normalized:
-            normalized = normalized.split(' - ')[0].strip()
-        
-        # Extract key information (company, amount, action)
-        import re
-        
-        # Extract company name and key numbers - expanded list
-        company_pattern = r'\b(strategy|matador|capital\s+b|bitmine|tether|microstrategy|tesla|square|coinbase|binance|sharplink|vivopower|bnc|trump\s+family)\b'
-        
-        company_match = re.search(company_pattern, normalized)
-        if not company_match:
-            return normalized
-        
-        company = company_match.group(1)
-        
-        # Look for patterns like "buys 155 BTC" or "Adds 155 BTC" first
-        acquisition_pattern = r'\b(buys?|adds?|acquires?|purchases?)\s+(\d+)\s*(btc|bitcoin|eth|ethereum|bnb|sol|ada|dot|link|avax|matic)\b'
-        acquisition_match = re.search(acquisition_pattern, normalized)
-        
-        if acquisition_match:
-            number = acquisition_match.group(2)
-            crypto = acquisition_match.group(3)
-            return f"{company} {number} {crypto}"
-        
-        # Fallback: look for the first number that appears with crypto in the title
-        number_pattern = r'\b(\d+)\s*(btc|bitcoin|eth|ethereum|bnb|sol|ada|dot|link|avax|matic)\b'
-        number_matches = list(re.finditer(number_pattern, normalized))
-        
-        if number_matches:
-            # Take the first match (usually the acquisition amount)
-            number = number_matches[0].group(1)
-            crypto = number_matches[0].group(2)
-            return f"{company} {number} {crypto}"
-        
-        # For announcements without specific numbers, use company + key action
-        action_pattern = r'\b(announces|announced|adds|added|acquires|acquired|buys|bought|purchases|purchased)\b'
-        action_match = re.search(action_pattern, normalized)
-        if action_match:
-            action = action_match.group(1)
-            return f"{company} {action}"
-        
-        # Special handling for MicroStrategy to avoid duplicates
-        if company == "strategy" or company == "microstrategy":
-            # Look for specific amounts to differentiate
-            amount_pattern = r'\b(\d+)\s*(btc|bitcoin|eth|ethereum)\b'
-            amount_match = re.search(amount_pattern, normalized)
-            if amount_match:
-                amount = amount_match.group(1)
-                crypto = amount_match.group(2)
-                return f"microstrategy {amount} {crypto}"
-            
-            # Look for specific announcement patterns
-            announcement_patterns = [
-                r'\b(announces|announced)\s+(?:that\s+)?(?:it\s+)?(?:has\s+)?(?:will\s+)?(?:plans\s+to\s+)?(?:to\s+)?(?:add|acquire|buy|purchase|expand|increase)',
-                r'\b(adds|added|acquires|acquired|buys|bought|purchases|purchased)\s+(?:an?\s+)?(?:additional\s+)?(?:more\s+)?(?:bitcoin|btc|ethereum|eth)',
-                r'\b(expands|expanded|increases|increased|boosts|boosted)\s+(?:its\s+)?(?:treasury|holdings|reserves|portfolio)'
-            ]
-            
-            for pattern in announcement_patterns:
-                if re.search(pattern, normalized):
-                    # Extract the action and any numbers
-                    action_match = re.search(r'\b(announces?|announced|adds?|added|acquires?|acquired|buys?|bought|purchases?|purchased|expands?|expanded|increases?|increased|boosts?|boosted)\b', normalized)
-                    if action_match:
-                        action = action_match.group(1)
-                        return f"microstrategy {action}"
-            
-            return "microstrategy announcement"
-        
-        return normalized
+        return self.title_normalizer.normalize(title)
+    
+    def normalize_titles(self, titles: List[str]) -> List[str]:
+        """Normalize a batch of titles for duplicate detection"""
+        return self.title_normalizer.normalize_many(titles)
     
     def parse_date(self, date_str: str) -> datetime:
         """Parse various date formats from RSS feeds"""
@@ -238,475 +1245,296 @@ class CryptoNewsScraper:
                         logger.warning(f"Could not parse date: {date_str}")
                         return datetime.now()
     
-    def fetch_news_from_rss(self, query: str) -> List[Dict[str, Any]]:
-        """Fetch news from Google News RSS feed for a specific query"""
-        try:
-            rss_url = self.get_google_news_rss_url(query)
-            logger.info(f"Fetching news from: {rss_url}")
-            
-            response = requests.get(rss_url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML using xmltodict
-            feed_data = xmltodict.parse(response.content)
-            articles = []
-            
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            
-            # Extract items from RSS feed
-            if 'rss' in feed_data and 'channel' in feed_data['rss']:
-                channel = feed_data['rss']['channel']
-                if 'item' in channel:
-                    items = channel['item'] if isinstance(channel['item'], list) else [channel['item']]
-                    
-                    for item in items:
-                        try:
-                            # Parse the publication date
-                            pub_date = self.parse_date(item.get('pubDate', ''))
-                            
-                            # Only include articles from the last 24 hours
-                            # Make sure both datetimes are timezone-aware for comparison
-                            if pub_date.tzinfo is None:
-                                pub_date = pub_date.replace(tzinfo=timezone.utc)
-                            
-                            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-                            
-                            if pub_date < cutoff_time:
-                                continue
-                            
-                            # Check if it's a treasury expansion or new announcement
-                            if self.is_treasury_expansion(item.get('title', ''), item.get('description', '')):
-                                # Extract the actual article URL
-                                actual_url = self.extract_actual_url(
-                                    item.get('description', ''), 
-                                    item.get('link', '')
-                                )
-                                
-                                article = {
-                                    'title': item.get('title', ''),
-                                    'description': item.get('description', ''),
-                                    'link': actual_url,
-                                    'published': pub_date.isoformat(),
-                                    'source': item.get('source', {}).get('title', 'Unknown') if isinstance(item.get('source'), dict) else 'Unknown',
-                                    'query': query
-                                }
-                                articles.append(article)
-                                logger.info(f"Found treasury expansion article: {item.get('title', '')}")
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing entry: {e}")
-                            continue
-                    
-            return articles
+    def _rss_item_to_dict(self, elem: ET.Element) -> Dict[str, Any]:
+        """Convert an <item> element into the same dict shape xmltodict produces"""
+        item = {}
+        for child in elem:
+            # Namespaced extensions (dc:, content:, media:) are not used by the filters
+            if child.tag.startswith('{'):
+                continue
+            text = (child.text or '').strip() or None
+            if child.attrib:
+                value = {f'@{key}': attr for key, attr in child.attrib.items()}
+                if text is not None:
+                    value['#text'] = text
+            else:
+                value = text
             
-        except Exception as e:
-            logger.error(f"Error fetching RSS feed for query '{query}': {e}")
-            return []
+            if child.tag in item:
+                if not isinstance(item[child.tag], list):
+                    item[child.tag] = [item[child.tag]]
+                item[child.tag].append(value)
+            else:
+                item[child.tag] = value
+        return item
     
-    def fetch_coindesk_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from CoinDesk RSS feed and filter for treasury-related content"""
+    def iter_rss_items(self, response: requests.Response):
+        """Stream <item> entries from a (stream=True) RSS response one at a time
+        
+        Items are parsed incrementally from the socket and discarded once yielded,
+        so memory stays flat no matter how large the feed is.
+        """
         try:
-            coindesk_rss_url = "https://www.coindesk.com/arc/outboundfeeds/rss/"
-            logger.info(f"Fetching news from CoinDesk RSS: {coindesk_rss_url}")
-            
-            response = requests.get(coindesk_rss_url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML using xmltodict
-            feed_data = xmltodict.parse(response.content)
-            articles = []
-            
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            
-            # Extract items from RSS feed
-            if 'rss' in feed_data and 'channel' in feed_data['rss']:
-                channel = feed_data['rss']['channel']
-                if 'item' in channel:
-                    items = channel['item'] if isinstance(channel['item'], list) else [channel['item']]
-                    
-                    for item in items:
-                        try:
-                            # Parse the publication date
-                            pub_date = self.parse_date(item.get('pubDate', ''))
-                            
-                            # Only include articles from the last 24 hours
-                            # Make sure both datetimes are timezone-aware for comparison
-                            if pub_date.tzinfo is None:
-                                pub_date = pub_date.replace(tzinfo=timezone.utc)
-                            
-                            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-                            
-                            if pub_date < cutoff_time:
-                                continue
-                            
-                            # Check if it's treasury-related content
-                            title = item.get('title', '')
-                            description = item.get('description', '')
-                            
-                            # Filter for treasury-related keywords (more comprehensive)
-                            treasury_keywords = [
-                                'treasury', 'bitcoin', 'ethereum', 'crypto', 'cryptocurrency',
-                                'acquisition', 'purchase', 'buys', 'adds', 'announces',
-                                'launches', 'investment', 'reserves', 'holdings',
-                                'microstrategy', 'strategy', 'tesla', 'square', 'coinbase',
-                                'binance', 'tether', 'matador', 'capital b', 'sharplink',
-                                'vivopower', 'bnc', 'trump family'
-                            ]
-                            
-                            text_to_check = f"{title} {description}".lower()
-                            has_treasury_keyword = any(keyword in text_to_check for keyword in treasury_keywords)
-                            
-                            # Use the same treasury expansion filter as Google News
-                            if has_treasury_keyword and self.is_treasury_expansion(title, description):
-                                article = {
-                                    'title': title,
-                                    'description': description,
-                                    'link': item.get('link', ''),
-                                    'published': pub_date.isoformat(),
-                                    'source': 'CoinDesk',
-                                    'query': 'coindesk_rss'
-                                }
-                                articles.append(article)
-                                logger.info(f"Found CoinDesk treasury article: {title}")
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing CoinDesk entry: {e}")
-                            continue
-                    
-            return articles
-            
-        except Exception as e:
-            logger.error(f"Error fetching CoinDesk RSS feed: {e}")
-            return []
+            response.raw.decode_content = True
+            channel = None
+            for event, elem in ET.iterparse(response.raw, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == 'channel':
+                        channel = elem
+                    continue
+                if elem.tag != 'item':
+                    continue
+                
+                yield self._rss_item_to_dict(elem)
+                
+                elem.clear()
+                if channel is not None:
+                    channel.remove(elem)
+        finally:
+            response.close()
     
-    def fetch_cryptonews_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from CryptoNews RSS feed and filter for treasury-related content"""
+    def iter_recent_rss_items(self, response: requests.Response, cutoff_time: datetime,
+                              date_ordered: bool = False):
+        """Stream (item, publication date) pairs for items published after cutoff_time
+        
+        For date_ordered (newest-first) feeds reading stops after EARLY_STOP_OLD_ITEMS
+        consecutive items older than the cutoff, leaving the rest of the body unparsed.
+        """
+        items = self.iter_rss_items(response)
+        old_in_a_row = 0
         try:
-            # Try multiple CryptoNews RSS URLs
-            cryptonews_urls = [
-                "https://cryptonews.com/news/feed",
-                "https://cryptonews.com/rss",
-                "https://cryptonews.com/feed"
-            ]
-            
-            for cryptonews_rss_url in cryptonews_urls:
+            for item in items:
                 try:
-                    logger.info(f"Trying CryptoNews RSS: {cryptonews_rss_url}")
-                    response = requests.get(cryptonews_rss_url, timeout=30)
+                    # Parse the publication date
+                    pub_date = self.parse_date(item.get('pubDate', ''))
+                except Exception as e:
+                    logger.error(f"Error processing entry: {e}")
+                    continue
+                
+                # Make sure both datetimes are timezone-aware for comparison
+                if pub_date.tzinfo is None:
+                    pub_date = pub_date.replace(tzinfo=timezone.utc)
+                
+                if pub_date < cutoff_time:
+                    old_in_a_row += 1
+                    if date_ordered and old_in_a_row >= EARLY_STOP_OLD_ITEMS:
+                        logger.info(f"Stopping early, reached items older than the cutoff: {response.url}")
+                        break
+                    continue
+                
+                old_in_a_row = 0
+                yield item, pub_date
+        finally:
+            items.close()
+    
+    def get_google_news_feed(self, query: str) -> Dict[str, Any]:
+        """Build the feed definition for one Google News search query"""
+        return {
+            'name': f"Google News '{query}'",
+            'urls': [self.get_google_news_rss_url(query)],
+            # Google News items carry their own source and point at redirect links
+            'source': None,
+            'query': query,
+            'prefilter_keywords': None,
+            'date_ordered': False,
+            'resolve_links': True
+        }
+    
+    def _get_keyword_matcher(self, keywords: Optional[List[str]]) -> Optional[re.Pattern]:
+        """Get the compiled matcher for a keyword list, compiling it only the first time"""
+        if not keywords:
+            return None
+        key = tuple(keywords)
+        with self._keyword_matchers_lock:
+            matcher = self._keyword_matchers.get(key)
+            if matcher is None:
+                matcher = compile_keyword_matcher(keywords)
+                self._keyword_matchers[key] = matcher
+            return matcher
+    
+    def _get_cutoff_time(self) -> datetime:
+        """Oldest publication time kept by the scraper (last 24 hours)"""
+        return datetime.now(timezone.utc) - timedelta(hours=24)
+    
+    def get_item_key(self, item: Dict[str, Any]) -> str:
+        """Stable identity of a feed item: its GUID, falling back to its link"""
+        guid = item.get('guid')
+        if isinstance(guid, dict):
+            guid = guid.get('#text')
+        return guid or item.get('link') or f"{item.get('title', '')}|{item.get('pubDate', '')}"
+    
+    def fetch_feed(self, feed: Dict[str, Any], cutoff_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch one feed (trying its fallback URLs in order) and return its new treasury articles
+        
+        Items already in the seen-item index are skipped without being classified
+        or resolved; their articles are already part of news_data.
+        """
+        return self._fetch_feed(feed, cutoff_time)[0]
+    
+    def _fetch_feed(self, feed: Dict[str, Any], cutoff_time: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """fetch_feed() plus the number of articles that are actually new
+        
+        A 304 reply hands back the articles cached from the last 200 reply, which
+        were already merged in an earlier run, so it reports 0 new articles.
+        """
+        name = feed['name']
+        if cutoff_time is None:
+            cutoff_time = self._get_cutoff_time()
+        try:
+            response = None
+            for url in feed['urls']:
+                try:
+                    logger.info(f"Fetching news from {name}: {url}")
+                    response = self._http_get(url, timeout=30, conditional=True, stream=True)
                     response.raise_for_status()
                     break  # If successful, break out of the loop
                 except Exception as e:
-                    logger.warning(f"Failed to fetch from {cryptonews_rss_url}: {e}")
-                    continue
-            else:
-                logger.error("All CryptoNews RSS URLs failed")
-                return []
+                    logger.warning(f"Failed to fetch from {url}: {e}")
+                    response = None
+            if response is None:
+                logger.error(f"All {name} RSS URLs failed")
+                return [], 0
             
-            # Parse XML using xmltodict
-            feed_data = xmltodict.parse(response.content)
-            articles = []
+            if response.status_code == 304:
+                return self._not_modified_articles(url, cutoff_time), 0
             
-            cutoff_time = datetime.now() - timedelta(hours=24)
+            prefilter = self._get_keyword_matcher(feed.get('prefilter_keywords'))
+            resolve_links = feed.get('resolve_links', False)
+            articles = []
+            seen_records = []
+            unresolved = []
             
-            # Extract items from RSS feed
-            if 'rss' in feed_data and 'channel' in feed_data['rss']:
-                channel = feed_data['rss']['channel']
-                if 'item' in channel:
-                    items = channel['item'] if isinstance(channel['item'], list) else [channel['item']]
+            # Stream items from the RSS feed, keeping only those after the cutoff
+            for item, pub_date in self.iter_recent_rss_items(response, cutoff_time, feed.get('date_ordered', False)):
+                try:
+                    item_key = self.get_item_key(item)
+                    if not self.seen_index.claim(item_key):
+                        continue
+                    
+                    title = item.get('title', '')
+                    description = item.get('description', '')
                     
-                    for item in items:
-                        try:
-                            # Parse the publication date
-                            pub_date = self.parse_date(item.get('pubDate', ''))
-                            
-                            # Only include articles from the last 24 hours
-                            # Make sure both datetimes are timezone-aware for comparison
-                            if pub_date.tzinfo is None:
-                                pub_date = pub_date.replace(tzinfo=timezone.utc)
-                            
-                            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-                            
-                            if pub_date < cutoff_time:
-                                continue
-                            
-                            # Check if it's treasury-related content
-                            title = item.get('title', '')
-                            description = item.get('description', '')
-                            
-                            # Filter for treasury-related keywords
-                            treasury_keywords = [
-                                'treasury', 'bitcoin', 'ethereum', 'crypto', 'cryptocurrency',
-                                'acquisition', 'purchase', 'buys', 'adds', 'announces',
-                                'launches', 'investment', 'reserves', 'holdings',
-                                'microstrategy', 'strategy', 'tesla', 'square', 'coinbase',
-                                'binance', 'tether', 'matador', 'capital b', 'sharplink',
-                                'vivopower', 'bnc', 'trump family'
-                            ]
-                            
-                            text_to_check = f"{title} {description}".lower()
-                            has_treasury_keyword = any(keyword in text_to_check for keyword in treasury_keywords)
-                            
-                            # Use the same treasury expansion filter as Google News
-                            if has_treasury_keyword and self.is_treasury_expansion(title, description):
-                                article = {
-                                    'title': title,
-                                    'description': description,
-                                    'link': item.get('link', ''),
-                                    'published': pub_date.isoformat(),
-                                    'source': 'CryptoNews',
-                                    'query': 'cryptonews_rss'
-                                }
-                                articles.append(article)
-                                logger.info(f"Found CryptoNews treasury article: {title}")
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing CryptoNews entry: {e}")
-                            continue
+                    # Cheap keyword check before the full treasury filter
+                    if prefilter is not None and not prefilter.search(f"{title} {description}".lower()):
+                        seen_records.append((item_key, False))
+                        continue
                     
-            return articles
+                    # Check if it's a treasury expansion or new announcement
+                    if not self.is_treasury_expansion(title, description):
+                        seen_records.append((item_key, False))
+                        continue
+                    
+                    link = item.get('link', '')
+                    if resolve_links:
+                        # Extract the actual article URL; redirects are followed in one batch below
+                        actual_url = self._extract_url_without_request(description, link)
+                        if actual_url is None:
+                            unresolved.append(len(articles))
+                        else:
+                            link = actual_url
+                    
+                    if feed.get('source'):
+                        source = feed['source']
+                    else:
+                        source = item.get('source', {}).get('title', 'Unknown') if isinstance(item.get('source'), dict) else 'Unknown'
+                    
+                    article = {
+                        'title': title,
+                        'description': description,
+                        'link': link,
+                        'published': pub_date.isoformat(),
+                        'source': source,
+                        'query': feed['query']
+                    }
+                    # Classified once here; the API, dashboards and history read the stored fields
+                    annotate_article(article)
+                    articles.append(article)
+                    seen_records.append((item_key, True))
+                    logger.info(f"Found {name} treasury article: {title}")
+                    
+                except Exception as e:
+                    logger.error(f"Error processing {name} entry: {e}")
+                    continue
+            
+            if unresolved:
+                resolved = self.resolve_links([articles[index]['link'] for index in unresolved])
+                for index in unresolved:
+                    articles[index]['link'] = resolved[articles[index]['link']]
+            
+            # Committed with the merged articles, so a failed run never marks items seen
+            with self._pending_seen_lock:
+                self._pending_seen.extend(seen_records)
+            self.validator_cache.store(url, response, articles)
+            return articles, len(articles)
             
         except Exception as e:
-            logger.error(f"Error fetching CryptoNews RSS feed: {e}")
-            return []
+            logger.error(f"Error fetching {name} RSS feed: {e}")
+            return [], 0
+    
+    def fetch_news_from_rss(self, query: str, cutoff_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch news from Google News RSS feed for a specific query"""
+        return self.fetch_feed(self.get_google_news_feed(query), cutoff_time)
+    
+    def _build_fetch_jobs(self, cutoff_time: datetime) -> List[Tuple[str, Callable[[], Tuple[List[Dict[str, Any]], int]], bool]]:
+        """Build the ordered list of (label, fetch function, is Google query) jobs for a full scrape
+        
+        Each fetch function returns (articles, new article count).
+        """
+        jobs = []
+        for query in self.queries:
+            feed = self.get_google_news_feed(query)
+            jobs.append((query, lambda feed=feed: self._fetch_feed(feed, cutoff_time), True))
+        
+        for feed in self.feeds:
+            jobs.append((self.get_feed_label(feed), lambda feed=feed: self._fetch_feed(feed, cutoff_time), False))
+        return jobs
+    
+    def get_feed_label(self, feed: Dict[str, Any]) -> str:
+        """Job label of a publisher feed, as used in progress reports and labels filters"""
+        return f"{feed['name']} RSS feed"
     
-    def fetch_cointelegraph_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from Cointelegraph RSS feed and filter for treasury-related content"""
+    def _report_progress(self, progress_callback: Optional[Callable[[str, str, int], None]],
+                         label: str, status: str, article_count: int = 0):
+        """Call progress_callback(label, status, article_count), ignoring errors in the callback"""
+        if progress_callback is None:
+            return
         try:
-            cointelegraph_rss_url = "https://cointelegraph.com/rss"
-            logger.info(f"Fetching news from Cointelegraph RSS: {cointelegraph_rss_url}")
-            
-            response = requests.get(cointelegraph_rss_url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML using xmltodict
-            feed_data = xmltodict.parse(response.content)
-            articles = []
-            
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            
-            # Extract items from RSS feed
-            if 'rss' in feed_data and 'channel' in feed_data['rss']:
-                channel = feed_data['rss']['channel']
-                if 'item' in channel:
-                    items = channel['item'] if isinstance(channel['item'], list) else [channel['item']]
-                    
-                    for item in items:
-                        try:
-                            # Parse the publication date
-                            pub_date = self.parse_date(item.get('pubDate', ''))
-                            
-                            # Only include articles from the last 24 hours
-                            # Make sure both datetimes are timezone-aware for comparison
-                            if pub_date.tzinfo is None:
-                                pub_date = pub_date.replace(tzinfo=timezone.utc)
-                            
-                            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-                            
-                            if pub_date < cutoff_time:
-                                continue
-                            
-                            # Check if it's treasury-related content
-                            title = item.get('title', '')
-                            description = item.get('description', '')
-                            
-                            # Filter for treasury-related keywords
-                            treasury_keywords = [
-                                'treasury', 'bitcoin', 'ethereum', 'crypto', 'cryptocurrency',
-                                'acquisition', 'purchase', 'buys', 'adds', 'announces',
-                                'launches', 'investment', 'reserves', 'holdings',
-                                'microstrategy', 'strategy', 'tesla', 'square', 'coinbase',
-                                'binance', 'tether', 'matador', 'capital b', 'sharplink',
-                                'vivopower', 'bnc', 'trump family'
-                            ]
-                            
-                            text_to_check = f"{title} {description}".lower()
-                            has_treasury_keyword = any(keyword in text_to_check for keyword in treasury_keywords)
-                            
-                            # Use the same treasury expansion filter as Google News
-                            if has_treasury_keyword and self.is_treasury_expansion(title, description):
-                                article = {
-                                    'title': title,
-                                    'description': description,
-                                    'link': item.get('link', ''),
-                                    'published': pub_date.isoformat(),
-                                    'source': 'Cointelegraph',
-                                    'query': 'cointelegraph_rss'
-                                }
-                                articles.append(article)
-                                logger.info(f"Found Cointelegraph treasury article: {title}")
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing Cointelegraph entry: {e}")
-                            continue
-                    
-            return articles
-            
+            progress_callback(label, status, article_count)
         except Exception as e:
-            logger.error(f"Error fetching Cointelegraph RSS feed: {e}")
-            return []
+            logger.error(f"Error in progress callback for '{label}': {e}")
     
-    def fetch_bitcoincom_rss(self) -> List[Dict[str, Any]]:
-        """Fetch news from Bitcoin.com RSS feed and filter for treasury-related content"""
+    def _run_fetch_job(self, job: Tuple[str, Callable[[], Tuple[List[Dict[str, Any]], int]], bool],
+                       progress_callback: Optional[Callable[[str, str, int], None]] = None) -> List[Dict[str, Any]]:
+        """Run a single fetch job, never letting an error escape into the worker pool"""
+        label, fetch, is_query = job
+        if is_query:
+            logger.info(f"Scraping news for query: {label}")
+        else:
+            logger.info(f"Scraping from {label}")
+        self._report_progress(progress_callback, label, 'running')
         try:
-            bitcoincom_rss_url = "https://news.bitcoin.com/feed/"
-            logger.info(f"Fetching news from Bitcoin.com RSS: {bitcoincom_rss_url}")
-            
-            response = requests.get(bitcoincom_rss_url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML using xmltodict
-            feed_data = xmltodict.parse(response.content)
-            articles = []
-            
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            
-            # Extract items from RSS feed
-            if 'rss' in feed_data and 'channel' in feed_data['rss']:
-                channel = feed_data['rss']['channel']
-                if 'item' in channel:
-                    items = channel['item'] if isinstance(channel['item'], list) else [channel['item']]
-                    
-                    for item in items:
-                        try:
-                            # Parse the publication date
-                            pub_date = self.parse_date(item.get('pubDate', ''))
-                            
-                            # Only include articles from the last 24 hours
-                            # Make sure both datetimes are timezone-aware for comparison
-                            if pub_date.tzinfo is None:
-                                pub_date = pub_date.replace(tzinfo=timezone.utc)
-                            
-                            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-                            
-                            if pub_date < cutoff_time:
-                                continue
-                            
-                            # Check if it's treasury-related content
-                            title = item.get('title', '')
-                            description = item.get('description', '')
-                            
-                            # Filter for treasury-related keywords
-                            treasury_keywords = [
-                                'treasury', 'bitcoin', 'ethereum', 'crypto', 'cryptocurrency',
-                                'acquisition', 'purchase', 'buys', 'adds', 'announces',
-                                'launches', 'investment', 'reserves', 'holdings',
-                                'microstrategy', 'strategy', 'tesla', 'square', 'coinbase',
-                                'binance', 'tether', 'matador', 'capital b', 'sharplink',
-                                'vivopower', 'bnc', 'trump family'
-                            ]
-                            
-                            text_to_check = f"{title} {description}".lower()
-                            has_treasury_keyword = any(keyword in text_to_check for keyword in treasury_keywords)
-                            
-                            # Use the same treasury expansion filter as Google News
-                            if has_treasury_keyword and self.is_treasury_expansion(title, description):
-                                article = {
-                                    'title': title,
-                                    'description': description,
-                                    'link': item.get('link', ''),
-                                    'published': pub_date.isoformat(),
-                                    'source': 'Bitcoin.com',
-                                    'query': 'bitcoincom_rss'
-                                }
-                                articles.append(article)
-                                logger.info(f"Found Bitcoin.com treasury article: {title}")
-                                
-                        except Exception as e:
-                            logger.error(f"Error processing Bitcoin.com entry: {e}")
-                            continue
-                    
-            return articles
-            
+            articles, new_count = fetch()
         except Exception as e:
-            logger.error(f"Error fetching Bitcoin.com RSS feed: {e}")
+            logger.error(f"Error running fetch job '{label}': {e}")
+            self._report_progress(progress_callback, label, 'failed')
             return []
+        self._report_progress(progress_callback, label, 'done', new_count)
+        return articles
     
-    def scrape_all_crypto_treasury_news(self) -> List[Dict[str, Any]]:
-        """Scrape NEW crypto treasury announcements from multiple relevant queries"""
-        queries = [
-            # Primary announcement queries
-            "crypto treasury announcement",
-            "bitcoin treasury announcement",
-            "ethereum treasury announcement",
-            "cryptocurrency treasury announcement",
-            "crypto company announces bitcoin",
-            "crypto company announces ethereum",
-            "crypto company announces treasury",
-            "bitcoin treasury acquisition announcement",
-            "ethereum treasury purchase announcement",
-            
-            # New initiative queries
-            "crypto treasury strategy announcement",
-            "crypto treasury policy announcement",
-            "crypto treasury program announcement",
-            "crypto treasury initiative announcement",
-            
-            # Recent acquisition queries (last 24 hours)
-            "crypto company adds bitcoin today",
-            "crypto company adds ethereum today",
-            "crypto company buys bitcoin today",
-            "crypto company buys ethereum today",
-            "treasury bitcoin acquisition today",
-            "treasury ethereum acquisition today",
-            
-            # New program queries
-            "crypto treasury investment program",
-            "crypto treasury acquisition program",
-            "crypto treasury expansion program",
-            
-            # Trading desk and treasury launch queries
-            "crypto trading desk launch",
-            "crypto treasury desk announcement",
-            "digital asset treasury launch",
-            "crypto treasury trading desk",
-            "company launches crypto treasury",
-            "corporation crypto treasury announcement"
-        ]
-        
-        all_articles = []
-        
-        # Scrape from Google News RSS feeds
-        for query in queries:
-            logger.info(f"Scraping news for query: {query}")
-            articles = self.fetch_news_from_rss(query)
-            all_articles.extend(articles)
-            
-            # Be respectful to the server
-            time.sleep(2)
-        
-        # Scrape from CoinDesk RSS feed
-        logger.info("Scraping from CoinDesk RSS feed")
-        coindesk_articles = self.fetch_coindesk_rss()
-        all_articles.extend(coindesk_articles)
-        
-        # Scrape from CryptoNews RSS feed
-        logger.info("Scraping from CryptoNews RSS feed")
-        cryptonews_articles = self.fetch_cryptonews_rss()
-        all_articles.extend(cryptonews_articles)
-        
-        # Scrape from Cointelegraph RSS feed
-        logger.info("Scraping from Cointelegraph RSS feed")
-        cointelegraph_articles = self.fetch_cointelegraph_rss()
-        all_articles.extend(cointelegraph_articles)
-        
-        # Scrape from Bitcoin.com RSS feed
-        logger.info("Scraping from Bitcoin.com RSS feed")
-        bitcoincom_articles = self.fetch_bitcoincom_rss()
-        all_articles.extend(bitcoincom_articles)
-        
-        # Remove duplicates based on link and similar titles
+    def _dedupe_and_sort(self, all_articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove duplicate articles by link and normalized title, newest first"""
         seen_links = set()
         seen_titles = set()
         unique_articles = []
         
-        for article in all_articles:
+        normalized_titles = self.normalize_titles([article['title'] for article in all_articles])
+        for article, normalized_title in zip(all_articles, normalized_titles):
             # Check for duplicate links
             if article['link'] in seen_links:
                 logger.info(f"Duplicate link found: {article['title']}")
                 continue
                 
-            # Check for similar titles (normalize and compare)
-            normalized_title = self.normalize_title(article['title'])
+            # Check for similar titles (normalized above in one batch)
             if normalized_title in seen_titles:
                 logger.info(f"Duplicate title found: {article['title']} -> {normalized_title}")
                 continue
@@ -717,74 +1545,177 @@ class CryptoNewsScraper:
         
         # Sort by publication date (newest first)
         unique_articles.sort(key=lambda x: x['published'], reverse=True)
+        return unique_articles
+    
+    def merge_articles(self, new_articles: List[Dict[str, Any]], cutoff_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Merge newly found articles into news_data, dropping articles older than the cutoff"""
+        if cutoff_time is None:
+            cutoff_time = self._get_cutoff_time()
+        # Taken up front: if the merge fails they are dropped and the items are fetched again next run
+        with self._pending_seen_lock:
+            seen_records, self._pending_seen = self._pending_seen, []
+        try:
+            with self._news_lock:
+                # Existing articles go first so an already published article wins the dedup
+                existing = [article for article in self.news_data if parse_published(article) >= cutoff_time]
+                self.news_data = self._dedupe_and_sort(existing + new_articles)
+                self.seen_index.save_articles(self.news_data, seen_records)
+                # Archive the new articles that survived the dedup
+                new_links = {article['link'] for article in new_articles}
+                self.history.add_articles([article for article in self.news_data if article['link'] in new_links])
+                return self.news_data
+        finally:
+            # Saved items are now seen; unsaved ones are free to be fetched again
+            self.seen_index.release_claims()
+    
+    def scrape_all_crypto_treasury_news(self, concurrent: bool = True,
+                                        progress_callback: Optional[Callable[[str, str, int], None]] = None,
+                                        labels: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Scrape NEW crypto treasury announcements from multiple relevant queries
+        
+        When concurrent is True the feeds are fetched on a thread pool of
+        max_workers threads, with per-host caps from host_concurrency. Results
+        are always combined in job order so dedup and sorting stay deterministic.
+        Request pacing comes from the per-host rate limiter in both modes.
+        Only items not seen in earlier runs are processed; the new articles are
+        merged into the existing article set.
+        
+        progress_callback, if given, is called as (label, status, article_count)
+        with status 'pending' for every feed up front, then 'running' and
+        'done' or 'failed' as each feed is fetched. For 'done', article_count is
+        the number of new articles (0 for a feed that answered 304).
+        
+        labels restricts the run to those jobs (Google queries and publisher feed
+        labels from get_feed_label); their new articles are merged into the full set.
+        """
+        # One cutoff for the whole run so every feed applies the same window
+        cutoff_time = self._get_cutoff_time()
+        self.seen_index.evict_expired()
+        jobs = self._build_fetch_jobs(cutoff_time)
+        if labels is not None:
+            wanted = set(labels)
+            jobs = [job for job in jobs if job[0] in wanted]
+        for label, _, _ in jobs:
+            self._report_progress(progress_callback, label, 'pending')
+        
+        run_job = lambda job: self._run_fetch_job(job, progress_callback)
+        if concurrent and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # map() yields results in submission order, not completion order
+                results = list(executor.map(run_job, jobs))
+        else:
+            results = [run_job(job) for job in jobs]
         
-        self.news_data = unique_articles
-        logger.info(f"Found {len(unique_articles)} unique crypto treasury expansion articles")
+        new_articles = []
+        for articles in results:
+            new_articles.extend(articles)
+        
+        unique_articles = self.merge_articles(new_articles, cutoff_time)
+        logger.info(f"Found {len(new_articles)} new and {len(unique_articles)} unique crypto treasury expansion articles")
+        
+        self.validator_cache.save()
+        cache_stats = self.get_cache_stats()
+        logger.info(f"Conditional GET cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                    f"{cache_stats['not_modified']} not modified")
+        
+        for host, stats in self.get_throttle_stats().items():
+            logger.info(f"Rate limiter {host}: {stats['requests']} requests, "
+                        f"{stats['throttled_requests']} throttled for {stats['throttled_seconds']:.1f}s")
         
         return unique_articles
     
+    def _extract_url_without_request(self, description: str, rss_link: str) -> Optional[str]:
+        """Extract the actual article URL from the description or RSS link, or None if a redirect must be followed"""
+        # First, try to extract URL from the description
+        # Google News RSS descriptions often contain the actual URL in an <a> tag
+        href_match = HREF_PATTERN.search(description)
+        if href_match:
+            actual_url = href_match.group(1)
+            # Remove Google News redirect parameters
+            if 'news.google.com' in actual_url:
+                # Extract the actual URL from Google News redirect
+                url_match = REDIRECT_URL_PATTERN.search(actual_url)
+                if url_match:
+                    return urllib.parse.unquote(url_match.group(1))
+            return actual_url
+        
+        # If no href found in description, try to extract from the RSS link itself
+        if 'news.google.com' in rss_link:
+            # Look for url parameter in the RSS link
+            url_match = REDIRECT_URL_PATTERN.search(rss_link)
+            if url_match:
+                return urllib.parse.unquote(url_match.group(1))
+        
+        return None
+    
+    def _follow_redirect(self, rss_link: str) -> Optional[str]:
+        """Follow the RSS link redirect and return the final article URL, or None on failure"""
+        try:
+            response = self._http_head(rss_link, timeout=10, allow_redirects=True)
+            if response.status_code == 200:
+                final_url = response.url
+                # If the final URL is still a Google News URL, try to extract the actual URL
+                if 'news.google.com' in final_url:
+                    url_match = REDIRECT_URL_PATTERN.search(final_url)
+                    if url_match:
+                        return urllib.parse.unquote(url_match.group(1))
+                return final_url
+        except Exception as e:
+            logger.warning(f"Error following redirect: {e}")
+        return None
+    
+    def resolve_links(self, rss_links: List[str]) -> Dict[str, str]:
+        """Resolve RSS links to article URLs, following uncached redirects concurrently
+        
+        Failed lookups are negatively cached and resolve to the RSS link itself.
+        """
+        resolved = {}
+        pending = []
+        for rss_link in dict.fromkeys(rss_links):
+            found, url = self.url_cache.get(rss_link)
+            if found:
+                resolved[rss_link] = url or rss_link
+            else:
+                pending.append(rss_link)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+                for rss_link, url in zip(pending, executor.map(self._follow_redirect, pending)):
+                    self.url_cache.put(rss_link, url)
+                    resolved[rss_link] = url or rss_link
+        return resolved
+    
     def extract_actual_url(self, description: str, rss_link: str) -> str:
         """Extract the actual article URL from the description or follow redirect"""
         try:
-            import re
-            import urllib.parse
-            
-            # First, try to extract URL from the description
-            # Google News RSS descriptions often contain the actual URL in an <a> tag
-            href_pattern = r'href="([^"]+)"'
-            href_match = re.search(href_pattern, description)
-            if href_match:
-                actual_url = href_match.group(1)
-                # Remove Google News redirect parameters
-                if 'news.google.com' in actual_url:
-                    # Extract the actual URL from Google News redirect
-                    url_match = re.search(r'url=([^&]+)', actual_url)
-                    if url_match:
-                        decoded_url = urllib.parse.unquote(url_match.group(1))
-                        return decoded_url
+            actual_url = self._extract_url_without_request(description, rss_link)
+            if actual_url is not None:
                 return actual_url
-            
-            # If no href found in description, try to extract from the RSS link itself
-            if 'news.google.com' in rss_link:
-                # Look for url parameter in the RSS link
-                url_match = re.search(r'url=([^&]+)', rss_link)
-                if url_match:
-                    decoded_url = urllib.parse.unquote(url_match.group(1))
-                    return decoded_url
-            
-            # If still no URL found, try to follow the RSS link redirect
-            try:
-                response = requests.head(rss_link, timeout=10, allow_redirects=True)
-                if response.status_code == 200:
-                    final_url = response.url
-                    # If the final URL is still a Google News URL, try to extract the actual URL
-                    if 'news.google.com' in final_url:
-                        url_match = re.search(r'url=([^&]+)', final_url)
-                        if url_match:
-                            decoded_url = urllib.parse.unquote(url_match.group(1))
-                            return decoded_url
-                    return final_url
-            except Exception as e:
-                logger.warning(f"Error following redirect: {e}")
-            
-            # Fallback to the original RSS link
-            return rss_link
-            
+            # If still no URL found, try to follow the RSS link redirect (cached)
+            return self.resolve_links([rss_link])[rss_link]
         except Exception as e:
             logger.warning(f"Error extracting actual URL: {e}")
             return rss_link
     
-    def save_to_json(self, filename: str = "crypto_treasury_news.json"):
-        """Save scraped news to JSON file"""
+    def save_to_json(self, filename: str = "crypto_treasury_news.json", format: str = NEWS_FILE_FORMAT,
+                     compress: bool = NEWS_FILE_COMPRESS) -> Optional[str]:
+        """Save scraped news to the news file and return the last_updated timestamp written
+        
+        The file is replaced atomically, so concurrent readers never see a partial write.
+        """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'last_updated': datetime.now().isoformat(),
+            last_updated = datetime.now().isoformat()
+            with self._news_lock:
+                data = {
+                    'last_updated': last_updated,
                     'articles': self.news_data
-                }, f, indent=2, ensure_ascii=False)
-            logger.info(f"News data saved to {filename}")
+                }
+                size = save_news_file(filename, data, format=format, compress=compress)
+            logger.info(f"News data saved to {filename} ({size} bytes)")
+            return last_updated
         except Exception as e:
             logger.error(f"Error saving to JSON: {e}")
+            return None
     
     def get_latest_news(self) -> List[Dict[str, Any]]:
         """Get the latest scraped news data"""
@@ -792,30 +1723,20 @@ class CryptoNewsScraper:
     
     def test_rss_feeds(self):
         """Test all RSS feeds to ensure they're working properly"""
-        feeds = [
-            ("CoinDesk", "https://www.coindesk.com/arc/outboundfeeds/rss/"),
-            ("CryptoNews", "https://cryptonews.com/news/feed"),
-            ("Cointelegraph", "https://cointelegraph.com/rss"),
-            ("Bitcoin.com", "https://news.bitcoin.com/feed/")
-        ]
+        feeds = [(feed['name'], feed['urls'][0]) for feed in self.feeds]
         
         for name, url in feeds:
             try:
                 logger.info(f"Testing {name} RSS feed: {url}")
-                response = requests.get(url, timeout=30)
+                response = self._http_get(url, timeout=30, stream=True)
                 response.raise_for_status()
                 
                 # Try to parse the XML
-                feed_data = xmltodict.parse(response.content)
-                if 'rss' in feed_data and 'channel' in feed_data['rss']:
-                    channel = feed_data['rss']['channel']
-                    if 'item' in channel:
-                        items = channel['item'] if isinstance(channel['item'], list) else [channel['item']]
-                        logger.info(f"✓ {name} RSS feed working - found {len(items)} items")
-                    else:
-                        logger.warning(f"⚠ {name} RSS feed has no items")
+                item_count = sum(1 for _ in self.iter_rss_items(response))
+                if item_count:
+                    logger.info(f"✓ {name} RSS feed working - found {item_count} items")
                 else:
-                    logger.warning(f"⚠ {name} RSS feed has invalid structure")
+                    logger.warning(f"⚠ {name} RSS feed has no items")
                     
             except Exception as e:
                 logger.error(f"✗ {name} RSS feed failed: {e}")
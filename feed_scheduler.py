@@ -0,0 +1,284 @@
+import random
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from refresh_jobs import RefreshJob, RefreshJobManager
+
+logger = logging.getLogger(__name__)
+
+# Starting polling intervals in seconds. Publisher feeds are single cheap requests and
+# carry the breaking stories, so they are polled often; the 28 Google News queries are
+# polled less often, keeping the total request rate at or below the old 30-minute cycle.
+GOOGLE_NEWS_INTERVAL = 45 * 60
+PUBLISHER_FEED_INTERVAL = 10 * 60
+
+# Bounds for the adaptive intervals
+GOOGLE_NEWS_INTERVAL_BOUNDS = (15 * 60, 4 * 60 * 60)
+PUBLISHER_FEED_INTERVAL_BOUNDS = (5 * 60, 60 * 60)
+
+# Each run is scheduled interval * (1 +/- JITTER_FRACTION) after the previous one
+JITTER_FRACTION = 0.1
+
+# Adaptive polling: intervals move toward the time in which a feed yields this many
+# new articles, judging the yield by an exponentially weighted moving average
+TARGET_NEW_ARTICLES_PER_POLL = 1.0
+YIELD_EWMA_ALPHA = 0.3
+# An interval changes by at most this factor per poll, so one lucky or empty poll can't swing it
+MAX_INTERVAL_STEP = 2.0
+
+class FeedYieldTracker:
+    """Per-group new-article rates and adapted poll intervals, persisted in SQLite
+
+    After each poll the observed rate (new articles per hour since the previous poll)
+    is folded into an EWMA, and the group's interval is moved toward
+    TARGET_NEW_ARTICLES_PER_POLL / rate within its bounds.
+    """
+
+    def __init__(self, filename: str = "scraper_state.db", alpha: float = YIELD_EWMA_ALPHA,
+                 target_per_poll: float = TARGET_NEW_ARTICLES_PER_POLL, max_step: float = MAX_INTERVAL_STEP):
+        self.alpha = alpha
+        self.target_per_poll = target_per_poll
+        self.max_step = max_step
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filename or ':memory:', check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS feed_yield ("
+            "name TEXT PRIMARY KEY, rate_per_hour REAL, interval REAL NOT NULL, "
+            "last_poll REAL NOT NULL, polls INTEGER NOT NULL, new_articles INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+        self.entries = {}
+        for name, rate, interval, last_poll, polls, new_articles in self.conn.execute(
+                "SELECT name, rate_per_hour, interval, last_poll, polls, new_articles FROM feed_yield"):
+            self.entries[name] = {'rate_per_hour': rate, 'interval': interval, 'last_poll': last_poll,
+                                  'polls': polls, 'new_articles': new_articles}
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.entries.get(name)
+            return dict(entry) if entry is not None else None
+
+    def _adapt(self, interval: float, rate_per_hour: Optional[float], bounds: Tuple[float, float]) -> float:
+        if rate_per_hour is None:
+            return interval
+        min_interval, max_interval = bounds
+        target = self.target_per_poll / rate_per_hour * 3600 if rate_per_hour > 0 else max_interval
+        target = min(max(target, interval / self.max_step), interval * self.max_step)
+        return min(max(target, min_interval), max_interval)
+
+    def record(self, name: str, new_articles: int, default_interval: float,
+               bounds: Tuple[float, float], polled_at: Optional[float] = None) -> float:
+        """Record a poll's new-article count and return the group's next interval"""
+        polled_at = polled_at if polled_at is not None else time.time()
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                # No previous poll to measure against; the first poll also sees the whole backlog
+                entry = {'rate_per_hour': None, 'interval': default_interval, 'last_poll': polled_at,
+                         'polls': 1, 'new_articles': new_articles}
+            else:
+                hours = max(polled_at - entry['last_poll'], 1.0) / 3600
+                observed = new_articles / hours
+                rate = entry['rate_per_hour']
+                rate = observed if rate is None else self.alpha * observed + (1 - self.alpha) * rate
+                entry = {
+                    'rate_per_hour': rate,
+                    'interval': self._adapt(entry['interval'], rate, bounds),
+                    'last_poll': polled_at,
+                    'polls': entry['polls'] + 1,
+                    'new_articles': entry['new_articles'] + new_articles
+                }
+            self.entries[name] = entry
+            self.conn.execute(
+                "INSERT OR REPLACE INTO feed_yield VALUES (?, ?, ?, ?, ?, ?)",
+                (name, entry['rate_per_hour'], entry['interval'], entry['last_poll'],
+                 entry['polls'], entry['new_articles']))
+            self.conn.commit()
+            return entry['interval']
+
+class ScheduledGroup:
+    """A set of fetch jobs (by label) scraped together on one interval
+
+    With a FeedYieldTracker the interval adapts to the group's yield within bounds.
+    """
+
+    def __init__(self, name: str, labels: List[str], interval: float,
+                 bounds: Optional[Tuple[float, float]] = None):
+        self.name = name
+        self.labels = list(labels)
+        self.default_interval = interval
+        self.interval = interval
+        self.bounds = bounds or (interval, interval)
+        self.rate_per_hour = None
+        self.next_run = 0.0
+        self.last_run = None
+        self.runs = 0
+        self.missed_runs = 0
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'feeds': len(self.labels),
+            'interval_seconds': round(self.interval, 1),
+            'new_articles_per_hour': round(self.rate_per_hour, 3) if self.rate_per_hour is not None else None,
+            'next_run_in_seconds': max(self.next_run - now, 0.0),
+            'runs': self.runs,
+            'missed_runs': self.missed_runs
+        }
+
+def build_feed_groups(scraper, google_interval: float = GOOGLE_NEWS_INTERVAL,
+                      publisher_interval: float = PUBLISHER_FEED_INTERVAL) -> List[ScheduledGroup]:
+    """One group per Google News query and per publisher feed, so each adapts on its own
+
+    A feed dict may set its own 'interval' (seconds) to override publisher_interval,
+    and 'interval_bounds' as (min, max) seconds.
+    """
+    groups = [ScheduledGroup(query, [query], google_interval, GOOGLE_NEWS_INTERVAL_BOUNDS)
+              for query in scraper.queries]
+    for feed in scraper.feeds:
+        groups.append(ScheduledGroup(feed['name'], [scraper.get_feed_label(feed)],
+                                     feed.get('interval', publisher_interval),
+                                     tuple(feed.get('interval_bounds', PUBLISHER_FEED_INTERVAL_BOUNDS))))
+    return groups
+
+class FeedScheduler:
+    """Runs each feed group on its own interval through a RefreshJobManager
+
+    - Jitter: every next run is offset by up to +/- jitter * interval so groups and
+      processes drift apart instead of hitting upstream in lockstep.
+    - Overlap prevention: due groups run from the scheduler thread as one batched job,
+      and the job manager never runs two scrapes at once (a manual refresh joins or queues).
+    - Adaptive intervals: with a tracker, each group's new-article count per poll
+      feeds its EWMA yield and the interval adapts; state survives restarts.
+    - Missed runs: a group that is overdue by more than one interval (e.g. after the
+      host slept or a long scrape) runs once, not once per missed slot.
+    - Shutdown: stop() wakes the scheduler thread and waits for it to exit.
+    """
+
+    def __init__(self, refresh_jobs: RefreshJobManager, groups: List[ScheduledGroup],
+                 jitter: float = JITTER_FRACTION, tracker: Optional[FeedYieldTracker] = None):
+        self.refresh_jobs = refresh_jobs
+        self.groups = groups
+        self.jitter = jitter
+        self.tracker = tracker
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def start(self):
+        """Start the scheduler thread
+
+        Groups with a persisted last poll resume their schedule; the rest are due immediately.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        now = time.monotonic()
+        wall_now = time.time()
+        for group in self.groups:
+            group.next_run = now
+            state = self.tracker.get(group.name) if self.tracker else None
+            if state is not None:
+                group.interval = state['interval']
+                group.rate_per_hour = state['rate_per_hour']
+                group.next_run = now + max(state['last_poll'] + group.interval - wall_now, 0.0)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name="feed-scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0):
+        """Stop scheduling and wait for the scheduler thread to exit
+
+        A scrape already in progress is not interrupted; the thread stops waiting
+        for it and exits.
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+        logger.info("Feed scheduler stopped")
+
+    def _next_due(self) -> ScheduledGroup:
+        with self.lock:
+            return min(self.groups, key=lambda group: group.next_run)
+
+    def _loop(self):
+        logger.info(f"Feed scheduler started with {len(self.groups)} groups")
+        while not self.stop_event.is_set():
+            delay = self._next_due().next_run - time.monotonic()
+            if delay > 0:
+                # Sleep until the next group is due, waking early on stop()
+                self.stop_event.wait(delay)
+                continue
+
+            # Everything due now goes into one job, fetched concurrently by the scraper
+            now = time.monotonic()
+            with self.lock:
+                due = [group for group in self.groups if group.next_run <= now]
+            for group in due:
+                overdue = now - group.next_run
+                if overdue > group.interval:
+                    with self.lock:
+                        group.missed_runs += int(overdue // group.interval)
+                    logger.warning(f"Feed group {group.name} is {overdue:.0f}s overdue; running once to catch up")
+
+            job = self._run_groups(due)
+
+            # Schedule from the time the run finished so a slow run can't cause a backlog
+            finished = time.monotonic()
+            for group in due:
+                interval = self._record_yield(group, job)
+                with self.lock:
+                    group.last_run = finished
+                    group.runs += 1
+                    group.interval = interval
+                    group.next_run = finished + self._jittered(interval)
+
+    def _run_groups(self, groups: List[ScheduledGroup]) -> Optional[RefreshJob]:
+        names = ', '.join(group.name for group in groups[:3]) + (f" and {len(groups) - 3} more" if len(groups) > 3 else '')
+        try:
+            labels = [label for group in groups for label in group.labels]
+            # With every group due (e.g. at startup) ask for a full refresh, so manual and
+            # /api/news refreshes join this job instead of queueing a second full scrape
+            job, started = self.refresh_jobs.start(None if len(groups) == len(self.groups) else labels)
+            if not started:
+                logger.info(f"Feed groups {names} joined refresh job {job.id}")
+            # Wait in short steps so stop() is not held up by a long scrape
+            while not job.wait(1.0):
+                if self.stop_event.is_set():
+                    return None
+            if job.error:
+                logger.error(f"Feed groups {names} failed: {job.error}")
+                return None
+            return job
+        except Exception as e:
+            logger.error(f"Error running feed groups {names}: {e}")
+            return None
+
+    def _record_yield(self, group: ScheduledGroup, job: Optional[RefreshJob]) -> float:
+        """Feed the group's new-article count into the tracker and return its next interval"""
+        if self.tracker is None:
+            return group.interval
+        feeds = job.to_dict()['feeds'] if job is not None else {}
+        results = [feeds.get(label) for label in group.labels]
+        if not results or any(result is None or result['status'] != 'done' for result in results):
+            # Failed or interrupted polls say nothing about the feed's publishing rate
+            return group.interval
+        new_articles = sum(result['new_articles'] for result in results)
+        interval = self.tracker.record(group.name, new_articles, group.default_interval, group.bounds)
+        state = self.tracker.get(group.name)
+        with self.lock:
+            group.rate_per_hour = state['rate_per_hour']
+        return interval
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Per-group interval, next run and run counters"""
+        now = time.monotonic()
+        with self.lock:
+            return [group.to_dict(now) for group in self.groups]
@@ -0,0 +1,120 @@
+"""Reading and writing the saved news file shared by the scraper, the API and the Streamlit app.
+
+Files are written atomically (temporary file + rename), so readers only ever
+see a complete previous or new version. The payload carries a format_version
+header, and the reader detects gzip and msgpack by content, so any supported
+combination can be read back with load_news_file().
+"""
+import gzip
+import json
+import os
+import tempfile
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the saved structure changes incompatibly
+FORMAT_VERSION = 1
+
+# Serialization formats accepted by save_news_file()
+FORMATS = ('json', 'orjson', 'msgpack')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# orjson and msgpack are optional; plain json is always available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+def serialize_news(data: Dict[str, Any], format: str = 'json', compress: bool = False) -> bytes:
+    """Serialize news data with a format_version header, optionally gzipped"""
+    payload = {'format_version': FORMAT_VERSION}
+    payload.update(data)
+
+    if format == 'json':
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    elif format == 'orjson':
+        if orjson is None:
+            raise ValueError("The orjson format requires the orjson package")
+        body = orjson.dumps(payload)
+    elif format == 'msgpack':
+        if msgpack is None:
+            raise ValueError("The msgpack format requires the msgpack package")
+        body = msgpack.packb(payload, use_bin_type=True)
+    else:
+        raise ValueError(f"Unknown news file format: {format} (expected one of {FORMATS})")
+
+    if compress:
+        # mtime=0 keeps the output deterministic for identical data
+        body = gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+def deserialize_news(body: bytes) -> Dict[str, Any]:
+    """Parse bytes written by serialize_news(), or a legacy pretty-printed JSON file"""
+    if body[:2] == GZIP_MAGIC:
+        body = gzip.decompress(body)
+
+    if body.lstrip()[:1] == b'{':
+        data = orjson.loads(body) if orjson is not None else json.loads(body.decode('utf-8'))
+    else:
+        if msgpack is None:
+            raise ValueError("News file is msgpack encoded but the msgpack package is not installed")
+        data = msgpack.unpackb(body, raw=False)
+
+    # Files written before the header was added have no format_version
+    version = data.pop('format_version', 0)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"News file format version {version} is newer than supported ({FORMAT_VERSION})")
+    return data
+
+# Permissions for newly created files. os.umask() can only be read by setting it,
+# so that is done once at import rather than while other threads may create files.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+def _file_mode(filename: str) -> int:
+    """The existing file's permission bits, else NEW_FILE_MODE"""
+    try:
+        return os.stat(filename).st_mode & 0o777
+    except FileNotFoundError:
+        return NEW_FILE_MODE
+
+def atomic_write(filename: str, body: bytes):
+    """Write bytes to filename via a temporary file in the same directory and os.replace()
+
+    The file keeps its permissions; mkstemp() alone would leave it readable by its owner only.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filename)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(filename))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def save_news_file(filename: str, data: Dict[str, Any], format: str = 'json', compress: bool = False) -> int:
+    """Atomically save news data; returns the number of bytes written"""
+    body = serialize_news(data, format=format, compress=compress)
+    atomic_write(filename, body)
+    return len(body)
+
+def load_news_file(filename: str) -> Dict[str, Any]:
+    """Load news data saved in any supported format"""
+    with open(filename, 'rb') as f:
+        return deserialize_news(f.read())
@@ -0,0 +1,180 @@
+"""Consolidate the Google News queries into fewer OR-combined searches.
+
+Queries that differ in a single word are merged into one search with an OR group,
+e.g. "crypto company (adds OR buys) bitcoin today", and merging repeats, so each
+merged search asks for exactly the union of the queries it replaces. The planner
+then fetches the current queries and the merged candidates, measures which
+deduplicated in-window articles each one returns, and greedily picks the smallest
+set of searches that still finds the articles of the full query set (set cover).
+
+The plan is written to query_plan.json, which CryptoNewsScraper uses on start.
+Re-run it now and then; a plan made for a different GOOGLE_NEWS_QUERIES list is ignored.
+
+Usage:
+    python query_planner.py [--min-recall 1.0] [--output query_plan.json] [--dry-run]
+"""
+import argparse
+import json
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from crypto_scraper import (CryptoNewsScraper, GOOGLE_NEWS_QUERIES, QUERY_PLAN_FILE,
+                            ArticleHistory, HTTPValidatorCache, ResolvedURLCache, SeenItemIndex)
+from news_storage import atomic_write
+
+# Upper bound on the alternatives in one OR group, so merged searches stay specific
+MAX_OR_ALTERNATIVES = 8
+
+# A search as word slots, each slot holding one or more alternatives
+Slots = Tuple[Tuple[str, ...], ...]
+
+def parse_query(query: str) -> Slots:
+    return tuple((word,) for word in query.split())
+
+def format_query(slots: Slots) -> str:
+    """Render slots as a Google search, with multi-word slots as (a OR b) groups"""
+    return ' '.join(alternatives[0] if len(alternatives) == 1 else f"({' OR '.join(alternatives)})"
+                    for alternatives in slots)
+
+def _single_difference(a: Slots, b: Slots) -> Optional[int]:
+    """The one slot position where a and b differ, or None if they differ elsewhere too"""
+    if len(a) != len(b):
+        return None
+    positions = [i for i, (x, y) in enumerate(zip(a, b)) if set(x) != set(y)]
+    return positions[0] if len(positions) == 1 else None
+
+def merge_queries(queries: List[str]) -> List[Tuple[str, List[str]]]:
+    """Merge queries differing in one slot until no more merges apply
+
+    Returns (search, original queries it replaces) pairs. Only merged searches are
+    returned; the original queries remain candidates on their own.
+    """
+    groups = [(parse_query(query), [query]) for query in queries]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(groups)):
+            for j in range(i + 1, len(groups)):
+                (a, members_a), (b, members_b) = groups[i], groups[j]
+                position = _single_difference(a, b)
+                if position is None:
+                    continue
+                alternatives = a[position] + tuple(word for word in b[position] if word not in a[position])
+                if len(alternatives) > MAX_OR_ALTERNATIVES:
+                    continue
+                slots = a[:position] + (alternatives,) + a[position + 1:]
+                groups[i] = (slots, members_a + members_b)
+                del groups[j]
+                merged = True
+                break
+            if merged:
+                break
+    return [(format_query(slots), members) for slots, members in groups if len(members) > 1]
+
+def create_planning_scraper() -> CryptoNewsScraper:
+    """A scraper with in-memory state, so planning never touches the app's caches or history"""
+    return CryptoNewsScraper(seen_index=SeenItemIndex(''), url_cache=ResolvedURLCache(''),
+                             history=ArticleHistory(''), validator_cache=HTTPValidatorCache(''),
+                             feeds=[], queries=[])
+
+def measure_coverage(scraper: CryptoNewsScraper, searches: List[str]) -> Dict[str, Set[int]]:
+    """Fetch each search and return the ids of the deduplicated articles it finds
+
+    Articles sharing a link or a normalized title get the same id, matching the
+    scraper's own link/title dedup.
+    """
+    cutoff_time = scraper._get_cutoff_time()
+    ids = {}
+    next_id = 0
+    coverage = {}
+    for number, search in enumerate(searches, 1):
+        # A fresh seen-item index per search, so each sees its full result list
+        scraper.seen_index = SeenItemIndex('')
+        articles = scraper.fetch_feed(scraper.get_google_news_feed(search), cutoff_time)
+        titles = scraper.normalize_titles([article['title'] for article in articles])
+        found = set()
+        for article, title in zip(articles, titles):
+            link_key, title_key = ('link', article['link']), ('title', title)
+            article_id = ids.get(link_key, ids.get(title_key))
+            if article_id is None:
+                article_id = next_id
+                next_id += 1
+            ids[link_key] = ids[title_key] = article_id
+            found.add(article_id)
+        coverage[search] = found
+        print(f"  [{number}/{len(searches)}] {len(found):3d} articles  {search}")
+    return coverage
+
+def select_queries(coverage: Dict[str, Set[int]], queries: List[str],
+                   candidates: List[Tuple[str, List[str]]], min_recall: float = 1.0) -> Tuple[List[str], Set[int], Set[int]]:
+    """Greedy set cover of the full query set's articles
+
+    Each step picks the search that adds the most uncovered articles, preferring
+    broader merged searches on ties, until min_recall is reached or nothing helps.
+    Returns (selected searches, baseline article ids, covered baseline ids).
+    """
+    baseline = set().union(*(coverage[query] for query in queries)) if queries else set()
+    target = math.ceil(min_recall * len(baseline))
+    remaining = [(search, len(members)) for search, members in candidates] + [(query, 1) for query in queries]
+    selected = []
+    covered = set()
+    while len(covered) < target and remaining:
+        best = max(remaining, key=lambda candidate: (len((coverage[candidate[0]] & baseline) - covered), candidate[1]))
+        gain = (coverage[best[0]] & baseline) - covered
+        if not gain:
+            break
+        selected.append(best[0])
+        covered |= gain
+        remaining.remove(best)
+    return selected, baseline, covered
+
+def build_plan(min_recall: float = 1.0, scraper: Optional[CryptoNewsScraper] = None) -> Dict:
+    queries = list(GOOGLE_NEWS_QUERIES)
+    candidates = merge_queries(queries)
+    print(f"{len(queries)} queries, {len(candidates)} merged candidates")
+    for search, members in candidates:
+        print(f"  {search}  <- {len(members)} queries")
+
+    scraper = scraper or create_planning_scraper()
+    searches = queries + [search for search, _ in candidates]
+    print(f"Measuring coverage with {len(searches)} requests")
+    coverage = measure_coverage(scraper, searches)
+
+    selected, baseline, covered = select_queries(coverage, queries, candidates, min_recall)
+    if not baseline:
+        raise SystemExit("The current queries found no in-window articles; not writing a plan")
+    found = set().union(*(coverage[search] for search in selected))
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'source_queries': queries,
+        'queries': selected,
+        'recall': round(len(covered) / len(baseline), 4),
+        'baseline_articles': len(baseline),
+        'covered_articles': len(covered),
+        'additional_articles': len(found - baseline),
+        'requests_per_run': {'before': len(queries), 'after': len(selected)},
+        'coverage': {search: len(coverage[search]) for search in selected}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--min-recall', type=float, default=1.0,
+                        help="Fraction of the full query set's articles the plan must find")
+    parser.add_argument('--output', default=QUERY_PLAN_FILE)
+    parser.add_argument('--dry-run', action='store_true', help="Print the plan without writing it")
+    args = parser.parse_args()
+
+    plan = build_plan(args.min_recall)
+    print(f"Selected {len(plan['queries'])} of {len(plan['source_queries'])} queries: "
+          f"recall {plan['recall']:.1%} ({plan['covered_articles']}/{plan['baseline_articles']} articles), "
+          f"{plan['additional_articles']} additional articles")
+    for search in plan['queries']:
+        print(f"  {plan['coverage'][search]:3d} articles  {search}")
+
+    if not args.dry_run:
+        atomic_write(args.output, json.dumps(plan, ensure_ascii=False, indent=2).encode('utf-8'))
+        print(f"Plan written to {args.output}")
+
+if __name__ == "__main__":
+    main()
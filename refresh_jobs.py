@@ -0,0 +1,137 @@
+import threading
+import uuid
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept around so their status can still be looked up
+MAX_FINISHED_JOBS = 20
+
+class RefreshJob:
+    """One scrape run plus its per-feed progress
+
+    labels is None for a full scrape, else the job labels (queries and feeds) to fetch.
+    """
+
+    def __init__(self, labels: Optional[List[str]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.labels = list(labels) if labels is not None else None
+        self.status = 'running'
+        self.started_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.error = None
+        self.article_count = None
+        self.feeds = OrderedDict()
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def covers(self, labels: Optional[List[str]]) -> bool:
+        """Whether this job fetches everything a request for labels would"""
+        if self.labels is None:
+            return True
+        return labels is not None and set(labels) <= set(self.labels)
+
+    def update_feed(self, label: str, status: str, article_count: int = 0):
+        """Progress callback passed to the scraper"""
+        with self.lock:
+            self.feeds[label] = {'status': status, 'new_articles': article_count}
+
+    def finish(self, article_count: Optional[int] = None, error: Optional[str] = None):
+        with self.lock:
+            self.status = 'failed' if error else 'completed'
+            self.error = error
+            self.article_count = article_count
+            self.finished_at = datetime.now().isoformat()
+        self.done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished; returns False on timeout"""
+        return self.done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            statuses = [feed['status'] for feed in self.feeds.values()]
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'labels': self.labels,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'error': self.error,
+                'article_count': self.article_count,
+                'feeds_total': len(statuses),
+                'feeds_done': sum(1 for status in statuses if status in ('done', 'failed')),
+                'feeds_failed': statuses.count('failed'),
+                'feeds': dict(self.feeds)
+            }
+
+class RefreshJobManager:
+    """Runs scrapes in the background with single-flight coalescing
+
+    At most one scrape runs at a time. Starting a refresh while one is in flight
+    returns the running job instead of starting another, so concurrent callers
+    share one scrape of the shared scraper instance. A request the in-flight job
+    doesn't cover (e.g. a full refresh during a single-feed run) is queued and
+    starts when that job finishes.
+    """
+
+    def __init__(self, run_scrape: Callable[..., Any]):
+        # run_scrape(progress_callback, labels) performs the scrape and returns the article list
+        self.run_scrape = run_scrape
+        self.lock = threading.Lock()
+        self.current = None
+        self.jobs = OrderedDict()
+
+    def start(self, labels: Optional[List[str]] = None) -> Tuple[RefreshJob, bool]:
+        """Start a refresh (of all feeds, or only labels), or join the one in flight
+
+        Returns (job, started).
+        """
+        with self.lock:
+            previous = self.current if self.current is not None and not self.current.done.is_set() else None
+            if previous is not None and previous.covers(labels):
+                return previous, False
+
+            job = RefreshJob(labels)
+            if previous is not None:
+                job.status = 'queued'
+            self.current = job
+            self.jobs[job.id] = job
+            # Forget the oldest finished jobs
+            while len(self.jobs) > MAX_FINISHED_JOBS + 1:
+                self.jobs.popitem(last=False)
+
+        threading.Thread(target=self._run, args=(job, previous), name=f"refresh-{job.id}", daemon=True).start()
+        return job, True
+
+    def is_running(self) -> bool:
+        with self.lock:
+            return self.current is not None and not self.current.done.is_set()
+
+    def latest(self) -> Optional[RefreshJob]:
+        """The running or queued job, else the most recent finished one"""
+        with self.lock:
+            return self.current
+
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job: RefreshJob, previous: Optional[RefreshJob] = None):
+        # Never overlap scrapes of the shared scraper
+        if previous is not None:
+            previous.wait()
+            with job.lock:
+                job.status = 'running'
+        logger.info(f"Refresh job {job.id} started")
+        try:
+            articles = self.run_scrape(job.update_feed, job.labels)
+        except Exception as e:
+            logger.error(f"Refresh job {job.id} failed: {e}")
+            job.finish(error=str(e))
+            return
+        job.finish(article_count=len(articles) if articles is not None else None)
+        logger.info(f"Refresh job {job.id} completed")
@@ -6,12 +6,16 @@ class CryptoNewsDashboard {
         this.statsData = {};
         this.isRefreshing = false;
         this.currentFilter = 'all';
+        this.newsCursor = null;
+        this.rowElements = new Map();
+        this.eventSource = null;
         this.init();
     }
 
     init() {
         this.bindEvents();
         this.loadInitialData();
+        this.startLiveUpdates();
         this.startAutoRefresh();
     }
 
@@ -30,11 +34,37 @@ class CryptoNewsDashboard {
                 this.renderNewsArticles();
             });
         });
+    }
 
-        // Auto-refresh every 5 minutes
-        setInterval(() => {
-            this.loadNewsData();
-        }, 300000); // 5 minutes
+    startLiveUpdates() {
+        // New articles are pushed over Server-Sent Events; polling is only a fallback
+        if (!window.EventSource) return;
+        
+        this.eventSource = new EventSource('/api/stream');
+        this.eventSource.addEventListener('news', (e) => this.handleNewsEvent(JSON.parse(e.data)));
+        this.eventSource.addEventListener('open', () => {
+            // Catch up on anything missed while disconnected
+            if (this.newsCursor) {
+                this.loadNewsChanges();
+            }
+        });
+    }
+
+    handleNewsEvent(data) {
+        // The initial load will include this change
+        if (!this.newsCursor) return;
+        
+        // Missed an event in between: fetch the gap instead
+        if (data.since !== this.newsCursor) {
+            this.loadNewsChanges();
+            return;
+        }
+        
+        this.newsCursor = data.cursor;
+        this.applyNewsChanges(data.added, data.removed);
+        this.updateLastUpdated(data.last_updated);
+        this.renderNewsArticles();
+        this.loadStatsData();
     }
 
     async loadInitialData() {
@@ -45,14 +75,21 @@ class CryptoNewsDashboard {
     }
 
     async loadNewsData() {
+        // After the first full load, only fetch what changed since our cursor
+        if (this.newsCursor) {
+            return this.loadNewsChanges();
+        }
+        
         try {
-            const response = await fetch('/api/news');
+            const response = await fetch('/api/news', { cache: 'no-store' });
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             
             const data = await response.json();
+            this.newsCursor = data.cursor || null;
             this.newsData = data.articles || [];
+            this.rowElements.clear();
             
             this.updateLastUpdated(data.last_updated);
             this.renderNewsArticles();
@@ -64,6 +101,44 @@ class CryptoNewsDashboard {
         }
     }
 
+    async loadNewsChanges() {
+        try {
+            const response = await fetch(`/api/news?since=${encodeURIComponent(this.newsCursor)}`, { cache: 'no-store' });
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            const data = await response.json();
+            this.newsCursor = data.cursor || null;
+            
+            if (data.reset) {
+                this.newsData = data.articles || [];
+                this.rowElements.clear();
+            } else if (data.added.length || data.removed.length) {
+                this.applyNewsChanges(data.added, data.removed);
+            } else {
+                return;
+            }
+            
+            this.updateLastUpdated(data.last_updated);
+            this.renderNewsArticles();
+            
+        } catch (error) {
+            console.error('Error loading news changes:', error);
+        }
+    }
+
+    applyNewsChanges(added, removed) {
+        // Drop removed and replaced articles, then merge in the new ones newest first
+        const changedLinks = new Set(removed.concat(added.map(article => article.link)));
+        changedLinks.forEach(link => this.rowElements.delete(link));
+        
+        this.newsData = this.newsData
+            .filter(article => !changedLinks.has(article.link))
+            .concat(added)
+            .sort((a, b) => new Date(b.published) - new Date(a.published));
+    }
+
     async loadStatsData() {
         try {
             const response = await fetch('/api/stats');
@@ -89,16 +164,19 @@ class CryptoNewsDashboard {
         this.showRefreshingState();
         
         try {
-            const response = await fetch('/api/refresh');
+            // The server runs the scrape in the background and hands back a job to poll
+            const response = await fetch('/api/refresh', { method: 'POST' });
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             
-            const data = await response.json();
-            this.newsData = data.articles || [];
+            const job = await this.waitForRefreshJob(await response.json());
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Refresh failed');
+            }
             
-            this.updateLastUpdated(data.last_updated);
-            this.renderNewsArticles();
+            // Pick up only what the refresh changed
+            await this.loadNewsData();
             
             // Show success message
             this.showSuccess('News refreshed successfully!');
@@ -112,6 +190,20 @@ class CryptoNewsDashboard {
         }
     }
 
+    async waitForRefreshJob(job) {
+        while (job.status === 'running' || job.status === 'queued') {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            
+            const response = await fetch(job.status_url || `/api/refresh/${job.job_id}`, { cache: 'no-store' });
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            job = { ...job, ...(await response.json()) };
+            this.showRefreshingState(job);
+        }
+        return job;
+    }
+
     updateLastUpdated(timestamp) {
         const lastUpdatedElement = document.getElementById('last-updated');
         if (lastUpdatedElement && timestamp) {
@@ -180,7 +272,6 @@ class CryptoNewsDashboard {
         }
         
         container.classList.remove('d-none');
-        tableBody.innerHTML = '';
         
         // Remove duplicates based on link
         const uniqueArticles = this.removeDuplicateArticles(this.newsData);
@@ -196,14 +287,12 @@ class CryptoNewsDashboard {
             filteredCountElement.textContent = filteredArticles.length;
         }
         
-        filteredArticles.forEach(article => {
-            const rowElement = this.createNewsTableRow(article);
-            tableBody.appendChild(rowElement);
-        });
+        this.patchTableRows(tableBody, filteredArticles);
         
         // Show no results message if filter returns no articles
         if (filteredArticles.length === 0 && uniqueArticles.length > 0) {
             const noResultsRow = document.createElement('tr');
+            noResultsRow.className = 'no-results-row';
             noResultsRow.innerHTML = `
                 <td colspan="4" class="text-center text-muted py-4">
                     <i class="fas fa-search fa-2x mb-3"></i>
@@ -215,6 +304,38 @@ class CryptoNewsDashboard {
         }
     }
 
+    patchTableRows(tableBody, articles) {
+        // Rows are keyed by link and reused, so only new articles are rendered and
+        // only rows that are added, removed or moved touch the DOM
+        const noResultsRow = tableBody.querySelector('.no-results-row');
+        if (noResultsRow) {
+            noResultsRow.remove();
+        }
+        
+        let current = tableBody.firstElementChild;
+        articles.forEach(article => {
+            let row = this.rowElements.get(article.link);
+            if (!row) {
+                row = this.createNewsTableRow(article);
+                row.dataset.link = article.link;
+                this.rowElements.set(article.link, row);
+            }
+            
+            if (row === current) {
+                current = current.nextElementSibling;
+            } else {
+                tableBody.insertBefore(row, current);
+            }
+        });
+        
+        // Anything after the last kept row is filtered out or removed
+        while (current) {
+            const next = current.nextElementSibling;
+            current.remove();
+            current = next;
+        }
+    }
+
     removeDuplicateArticles(articles) {
         const seenLinks = new Set();
         const seenTitles = new Set();
@@ -351,63 +472,10 @@ class CryptoNewsDashboard {
     }
 
     getArticleType(article) {
-        const text = `${article.title} ${article.description || ''}`.toLowerCase();
-        
-        // Primary expansion keywords (strong indicators)
-        const primaryExpansionKeywords = [
-            'buys', 'bought', 'purchases', 'purchased', 'purchase',
-            'acquires', 'acquired', 'acquisition',
-            'adds', 'added', 'addition'
-        ];
-        
-        // Secondary expansion keywords (weaker indicators)
-        const secondaryExpansionKeywords = [
-            'expands', 'expanded', 'expansion', 'increases', 'increased', 'increase',
-            'boosts', 'boosted', 'boost', 'grows', 'grew', 'growth'
-        ];
-        
-        // Primary announcement keywords (strong indicators)
-        const primaryAnnouncementKeywords = [
-            'announces', 'announced', 'announcement',
-            'launches', 'launched', 'launch',
-            'reveals', 'revealed', 'reveal',
-            'unveils', 'unveiled', 'unveil'
-        ];
-        
-        // Secondary announcement keywords (weaker indicators)
-        const secondaryAnnouncementKeywords = [
-            'new', 'fresh', 'latest', 'recent', 'updates', 'updated',
-            'strategic', 'investment', 'portfolio'
-        ];
-        
-        // Check for primary expansion keywords
-        const hasPrimaryExpansion = primaryExpansionKeywords.some(keyword => text.includes(keyword));
-        const hasSecondaryExpansion = secondaryExpansionKeywords.some(keyword => text.includes(keyword));
-        
-        // Check for primary announcement keywords
-        const hasPrimaryAnnouncement = primaryAnnouncementKeywords.some(keyword => text.includes(keyword));
-        const hasSecondaryAnnouncement = secondaryAnnouncementKeywords.some(keyword => text.includes(keyword));
-        
-        // Determine type based on priority
-        if (hasPrimaryExpansion && hasPrimaryAnnouncement) {
-            return 'Expansion & Announcement';
-        } else if (hasPrimaryExpansion) {
-            return 'Expansion';
-        } else if (hasPrimaryAnnouncement) {
-            return 'New Announcement';
-        } else if (hasSecondaryExpansion && hasSecondaryAnnouncement) {
-            return 'Treasury Activity';
-        } else if (hasSecondaryExpansion) {
-            return 'Expansion';
-        } else if (hasSecondaryAnnouncement) {
-            return 'New Announcement';
-        } else {
-            return 'Treasury Activity';
-        }
+        // Classified once by the scraper at ingest
+        return article.article_type || 'Treasury Activity';
     }
 
-
-
     createNewsTableRow(article) {
         const row = document.createElement('tr');
         row.className = 'table-row-hover';
@@ -528,11 +596,12 @@ class CryptoNewsDashboard {
         }
     }
 
-    showRefreshingState() {
+    showRefreshingState(job) {
         const refreshBtn = document.getElementById('refresh-btn');
         if (refreshBtn) {
+            const progress = job && job.feeds_total ? ` ${job.feeds_done}/${job.feeds_total}` : '';
             refreshBtn.disabled = true;
-            refreshBtn.innerHTML = '<i class="fas fa-sync-alt me-2 refreshing"></i>Refreshing...';
+            refreshBtn.innerHTML = `<i class="fas fa-sync-alt me-2 refreshing"></i>Refreshing...${progress}`;
         }
     }
 
@@ -586,7 +655,16 @@ class CryptoNewsDashboard {
     }
 
     startAutoRefresh() {
-        // Auto-refresh every 30 minutes
+        // Without a live stream, poll for changes every 5 minutes
+        if (!this.eventSource) {
+            setInterval(() => {
+                this.loadNewsData();
+                this.loadStatsData();
+            }, 300000); // 5 minutes
+            return;
+        }
+        
+        // With the stream, a slow safety-net check every 30 minutes is enough
         setInterval(() => {
             this.loadNewsData();
             this.loadStatsData();
@@ -1,9 +1,12 @@
 import streamlit as st
-import json
+import html
+from bs4 import BeautifulSoup
 import os
-from datetime import datetime
-import requests
-from crypto_scraper import CryptoNewsScraper
+import threading
+from datetime import datetime, timedelta
+from crypto_scraper import CryptoNewsScraper, HTTPValidatorCache, SeenItemIndex, ensure_annotated
+from news_storage import load_news_file
+from refresh_jobs import RefreshJobManager
 import time
 
 # Page configuration
@@ -70,6 +73,11 @@ st.markdown("""
         color: white; 
     }
     
+    .badge-both { 
+        background: linear-gradient(135deg, #f7971e 0%, #ffd200 100%);
+        color: #1f2937; 
+    }
+    
     .badge-activity { 
         background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
         color: white; 
@@ -126,53 +134,165 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Seen items, the merged article set and the HTTP validators of this app; kept apart from
+# the Flask app's files so neither process overwrites the other's article set, and a 304
+# never replays articles that only the other process has stored
+STATE_FILE = "streamlit_scraper_state.db"
+HTTP_CACHE_FILE = "streamlit_http_cache.json"
+
 # Initialize scraper
 @st.cache_resource
 def get_scraper():
-    return CryptoNewsScraper()
+    return CryptoNewsScraper(seen_index=SeenItemIndex(STATE_FILE),
+                             validator_cache=HTTPValidatorCache(HTTP_CACHE_FILE))
 
 scraper = get_scraper()
 
-# Load news data - NO CACHING to ensure fresh data
+# Article types assigned by the scraper at ingest
+ARTICLE_TYPES = ['New Announcement', 'Expansion', 'Expansion & Announcement', 'Treasury Activity']
+ANNOUNCEMENT_TYPES = ['New Announcement', 'Expansion & Announcement']
+# Article types shown by each filter option
+FILTER_TYPES = {
+    'all': ARTICLE_TYPES,
+    'announcements': ANNOUNCEMENT_TYPES,
+    'expansions': ['New Announcement', 'Expansion', 'Expansion & Announcement']
+}
+BADGE_CLASSES = {
+    'New Announcement': 'badge-announcement',
+    'Expansion': 'badge-expansion',
+    'Expansion & Announcement': 'badge-both'
+}
+
+# Article history browser settings
+HISTORY_PAGE_SIZE = 25
+
+# Article feed settings
+NEWS_FILE = 'crypto_treasury_news.json'
+FEED_PAGE_SIZE = 50
+
+def news_file_mtime():
+    try:
+        return os.stat(NEWS_FILE).st_mtime
+    except OSError:
+        return None
+
+# Positions of the articles of each type, so filters pick from lists instead of rescanning text
+def build_type_index(articles):
+    type_index = {article_type: [] for article_type in ARTICLE_TYPES}
+    for position, article in enumerate(articles):
+        type_index.setdefault(article['article_type'], []).append(position)
+    return type_index
+
+# One article card as a single line of HTML, so many cards can go into one st.markdown call
+def render_article_card(article):
+    article_type = article['article_type']
+    badge_class = BADGE_CLASSES.get(article_type, 'badge-activity')
+    
+    # Format date
+    try:
+        pub_date = datetime.fromisoformat(article.get('published', '').replace('Z', '+00:00'))
+        formatted_date = pub_date.strftime('%b %d, %H:%M')
+    except:
+        formatted_date = "Unknown"
+    
+    # Feed descriptions are HTML (Google News links, Cointelegraph images): keep only the text
+    description = BeautifulSoup(article.get('description') or '', 'html.parser').get_text(' ', strip=True)
+    description = (description or 'No description')[:250]
+    return (
+        '<div class="article-card">'
+        '<div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">'
+        f'<h4 class="article-title"><a href="{html.escape(article.get("link", "#"))}" target="_blank">'
+        f'{html.escape(article.get("title", "No title"))}</a></h4>'
+        f'<span class="badge {badge_class}">{html.escape(article_type)}</span>'
+        '</div>'
+        '<p style="color: #6b7280; margin: 0.5rem 0; font-size: 0.9rem; line-height: 1.5;">'
+        f'{html.escape(description)}...</p>'
+        '<div class="article-meta">'
+        f'<span>📅 {formatted_date}</span>'
+        f'<span>📰 {html.escape(article.get("source", "Unknown"))}</span>'
+        f'<span>🔍 {html.escape(article.get("query", "Unknown"))}</span>'
+        '</div>'
+        '</div>'
+    )
+
+# Parse the news file once per version; the mtime argument is the cache key. cache_resource
+# hands every rerun the same object instead of unpickling a copy; the view is read-only.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_news_view(mtime):
+    data = load_news_file(NEWS_FILE)
+    articles = ensure_annotated(data.get('articles', []))
+    return {
+        'last_updated': data.get('last_updated'),
+        'articles': articles,
+        'type_index': build_type_index(articles),
+        'source_count': len(set(article.get('source', 'Unknown') for article in articles)),
+        'cards': [render_article_card(article) for article in articles]
+    }
+
 def load_news_data():
+    mtime = news_file_mtime()
+    if mtime is None:
+        return {'last_updated': None, 'articles': [], 'type_index': build_type_index([]), 'source_count': 0, 'cards': []}
     try:
-        if os.path.exists('crypto_treasury_news.json'):
-            with open('crypto_treasury_news.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                st.write(f"DEBUG: Loaded {len(data.get('articles', []))} articles from JSON")
-                return data
-        else:
-            st.write("DEBUG: No JSON file found")
-            return {'articles': [], 'last_updated': None}
+        return load_news_view(mtime)
     except Exception as e:
-        st.write(f"DEBUG: Error loading data: {e}")
-        return {'articles': [], 'last_updated': None}
+        st.error(f"Error loading news data: {e}")
+        return {'last_updated': None, 'articles': [], 'type_index': build_type_index([]), 'source_count': 0, 'cards': []}
+
+# Seconds between scheduled background refreshes
+REFRESH_INTERVAL_SECONDS = 1800
+
+# Seconds between page reruns while a refresh is running, to update its progress
+REFRESH_STATUS_POLL_SECONDS = 2
 
-# Get article type
-def get_article_type(article):
-    text = f"{article.get('title', '')} {article.get('description', '')}".lower()
-    
-    # Primary announcement keywords
-    primary_announcement = [
-        'announces', 'announced', 'announcement', 'launches', 'launched', 'launch',
-        'reveals', 'revealed', 'reveal', 'unveils', 'unveiled', 'unveil'
-    ]
-    
-    # Expansion keywords
-    expansion_keywords = [
-        'buys', 'bought', 'purchases', 'purchased', 'acquires', 'acquired', 
-        'adds', 'added', 'expands', 'expanded', 'increases', 'increased'
-    ]
-    
-    # Check for primary announcement keywords first
-    if any(keyword in text for keyword in primary_announcement):
-        return 'New Announcement'
-    
-    # Check for expansion keywords
-    if any(keyword in text for keyword in expansion_keywords):
-        return 'Expansion'
-    
-    return 'Treasury Activity'
+def run_scrape(progress_callback=None, labels=None):
+    articles = scraper.scrape_all_crypto_treasury_news(progress_callback=progress_callback, labels=labels)
+    scraper.save_to_json()
+    return articles
+
+def scheduled_refresh_loop(refresher):
+    """Refresh whenever the news file is older than REFRESH_INTERVAL_SECONDS"""
+    while True:
+        try:
+            mtime = news_file_mtime()
+            age = time.time() - mtime if mtime is not None else None
+            if age is None or age >= REFRESH_INTERVAL_SECONDS:
+                job, _ = refresher.start()
+                job.wait()
+                age = 0
+            time.sleep(max(REFRESH_INTERVAL_SECONDS - age, 1))
+        except Exception as e:
+            print(f"Error in scheduled refresh: {e}")
+            time.sleep(60)
+
+# One refresher and scheduler thread per process, shared by every session. Scrapes are
+# single-flight, so sessions asking for a refresh while one is running just join it.
+@st.cache_resource
+def get_refresher():
+    refresher = RefreshJobManager(run_scrape)
+    threading.Thread(target=scheduled_refresh_loop, args=(refresher,), name="streamlit-refresh", daemon=True).start()
+    return refresher
+
+refresher = get_refresher()
+
+# Non-blocking status of the shared background refresh
+def render_refresh_status():
+    job = refresher.latest()
+    if job is None:
+        return
+    status = job.to_dict()
+    
+    if status['status'] in ('running', 'queued'):
+        total = status['feeds_total']
+        progress = status['feeds_done'] / total if total else 0.0
+        st.progress(progress, text=f"Refreshing news in the background: {status['feeds_done']}/{total} feeds")
+    elif st.session_state.get('refresh_job_id') == job.id:
+        # Report the outcome once to the session that asked for the refresh
+        del st.session_state['refresh_job_id']
+        if status['status'] == 'failed':
+            st.error(f"Error refreshing news: {status['error']}")
+        else:
+            st.success("News refreshed successfully!")
 
 # Main app
 def main():
@@ -205,31 +325,25 @@ def main():
     with col3:
         col3a, col3b = st.columns(2)
         with col3a:
-            if st.button("🔄 Refresh News", type="primary", use_container_width=True):
-                with st.spinner("Refreshing news data..."):
-                    try:
-                        articles = scraper.scrape_all_crypto_treasury_news()
-                        scraper.save_to_json()
-                        st.success("News refreshed successfully!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error refreshing news: {e}")
+            # Starts (or joins) a background scrape; the page stays interactive meanwhile
+            if st.button("🔄 Refresh News", type="primary", use_container_width=True,
+                         disabled=refresher.is_running()):
+                job, _ = refresher.start()
+                st.session_state['refresh_job_id'] = job.id
         
         with col3b:
             if st.button("🔄 Force Reload", use_container_width=True):
-                st.cache_data.clear()
-                st.cache_resource.clear()
+                # Only the news view: the scraper and refresher are shared across sessions
+                load_news_view.clear()
                 st.success("Cache cleared! Reloading data...")
                 st.rerun()
     
-    # Load data
-    data = load_news_data()
-    articles = data.get('articles', [])
+    render_refresh_status()
     
-    # Debug info
-    st.write(f"DEBUG: Found {len(articles)} articles in data")
-    if articles:
-        st.write(f"DEBUG: First article: {articles[0].get('title', 'No title')[:50]}...")
+    # Load data (cached until the news file changes)
+    data = load_news_data()
+    articles = data['articles']
+    type_index = data['type_index']
     
     # Statistics
     col1, col2, col3, col4 = st.columns(4)
@@ -243,17 +357,16 @@ def main():
         """, unsafe_allow_html=True)
     
     with col2:
-        sources = set(article.get('source', 'Unknown') for article in articles)
         st.markdown(f"""
         <div class="metric-card">
             <h3>📰 News Sources</h3>
-            <h2>{len(sources)}</h2>
+            <h2>{data['source_count']}</h2>
         </div>
         """, unsafe_allow_html=True)
     
     with col3:
         # Count new announcements
-        new_announcements = sum(1 for article in articles if get_article_type(article) == 'New Announcement')
+        new_announcements = sum(len(type_index[article_type]) for article_type in ANNOUNCEMENT_TYPES)
         st.markdown(f"""
         <div class="metric-card">
             <h3>📢 New Announcements</h3>
@@ -332,63 +445,69 @@ def main():
     if not articles:
         st.info("No articles found. Try refreshing the news or check back later.")
     else:
-        # Filter articles
-        filtered_articles = []
-        for article in articles:
-            article_type = get_article_type(article)
-            
-            if filter_type == 'all':
-                filtered_articles.append(article)
-            elif filter_type == 'announcements':
-                if article_type == 'New Announcement':
-                    filtered_articles.append(article)
-            elif filter_type == 'expansions':
-                if article_type in ['New Announcement', 'Expansion']:
-                    filtered_articles.append(article)
-        
-        st.write(f"DEBUG: After filtering: {len(filtered_articles)} articles")
+        # Filter articles by merging the precomputed per-type positions, keeping the original order
+        if filter_type == 'all':
+            positions = range(len(articles))
+        else:
+            positions = sorted(position for article_type in FILTER_TYPES[filter_type]
+                               for position in type_index.get(article_type, []))
         
-        if not filtered_articles:
+        if not positions:
             st.info("No articles match the current filter. Try selecting a different filter option.")
         else:
-            for article in filtered_articles:
-                article_type = get_article_type(article)
-                
-                # Determine badge class
-                if article_type == 'New Announcement':
-                    badge_class = 'badge-announcement'
-                elif article_type == 'Expansion':
-                    badge_class = 'badge-expansion'
-                else:
-                    badge_class = 'badge-activity'
-                
-                # Format date
-                try:
-                    pub_date = datetime.fromisoformat(article.get('published', '').replace('Z', '+00:00'))
-                    formatted_date = pub_date.strftime('%b %d, %H:%M')
-                except:
-                    formatted_date = "Unknown"
-                
-                st.markdown(f"""
-                <div class="article-card">
-                    <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
-                        <h4 class="article-title">
-                            <a href="{article.get('link', '#')}" target="_blank">
-                                {article.get('title', 'No title')}
-                            </a>
-                        </h4>
-                        <span class="badge {badge_class}">{article_type}</span>
-                    </div>
-                    <p style="color: #6b7280; margin: 0.5rem 0; font-size: 0.9rem; line-height: 1.5;">
-                        {article.get('description', 'No description')[:250]}...
-                    </p>
-                    <div class="article-meta">
-                        <span>📅 {formatted_date}</span>
-                        <span>📰 {article.get('source', 'Unknown')}</span>
-                        <span>🔍 {article.get('query', 'Unknown')}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            # One page of pre-rendered cards in a single markdown call
+            page_count = -(-len(positions) // FEED_PAGE_SIZE)
+            page = 1
+            if page_count > 1:
+                page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+            page_positions = positions[(page - 1) * FEED_PAGE_SIZE:page * FEED_PAGE_SIZE]
+            st.markdown("\n".join(data['cards'][position] for position in page_positions), unsafe_allow_html=True)
+    
+    # Article history (SQLite archive kept beyond the 24-hour window)
+    st.markdown("## 📚 Article History")
+    
+    with st.expander("Browse archived articles", expanded=False):
+        hcol1, hcol2, hcol3, hcol4 = st.columns([2, 2, 2, 1])
+        with hcol1:
+            date_range = st.date_input("Published between", value=())
+        with hcol2:
+            history_source = st.selectbox("Source", options=['All'] + scraper.history.get_sources())
+        with hcol3:
+            history_type = st.selectbox("Type", options=['All'] + ARTICLE_TYPES)
+        with hcol4:
+            history_page = st.number_input("Page", min_value=1, value=1, step=1)
+        
+        start = end = None
+        if len(date_range) == 2:
+            start = datetime.combine(date_range[0], datetime.min.time())
+            end = datetime.combine(date_range[1] + timedelta(days=1), datetime.min.time())
+        
+        history = scraper.history.query_articles(
+            start=start,
+            end=end,
+            source=None if history_source == 'All' else history_source,
+            article_type=None if history_type == 'All' else history_type,
+            limit=HISTORY_PAGE_SIZE,
+            page=int(history_page)
+        )
+        
+        total_pages = max(1, -(-history['total'] // HISTORY_PAGE_SIZE))
+        st.caption(f"{history['total']} archived articles • page {int(history_page)} of {total_pages}")
+        if history['articles']:
+            st.dataframe(
+                [{
+                    'Published': article.get('published', ''),
+                    'Title': article.get('title', ''),
+                    'Type': article['article_type'],
+                    'Source': article.get('source', 'Unknown'),
+                    'Link': article.get('link', '')
+                } for article in history['articles']],
+                column_config={'Link': st.column_config.LinkColumn('Link')},
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.info("No archived articles match these filters.")
     
     # Footer
     st.markdown("---")
@@ -398,6 +517,12 @@ def main():
         <p>🔄 Auto-refresh every 30 minutes • 📢 Focused on NEW treasury announcements</p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # Rerun after rendering while a refresh is in flight, so the progress bar advances
+    # and its outcome (plus the new articles) shows up without any interaction
+    if refresher.is_running():
+        time.sleep(REFRESH_STATUS_POLL_SECONDS)
+        st.rerun()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file